@@ -0,0 +1,45 @@
+"""Cost of assigning a trait compared to a plain attribute
+
+Assignments to traits nobody observes skip the event engine,
+so they should approach the cost of validation plus a dict store.
+"""
+import timeit
+
+from stately import Stately, Instance
+
+
+class Plain(object):
+
+    def __init__(self):
+        self.x = 0
+
+
+class Unobserved(Stately):
+
+    x = Instance(int)
+
+
+class Observed(Stately):
+
+    x = Instance(int)
+
+    def __init__(self):
+        super(Observed, self).__init__()
+        self.observe("x", observer=lambda obj, event: None)
+
+
+def bench(cls, number=100000):
+    obj = cls()
+    def assign():
+        obj.x = 1
+    return min(timeit.repeat(assign, number=number, repeat=3)) / number
+
+
+def main():
+    print("%-12s %s" % ("object", "usec/assignment"))
+    for cls in (Plain, Unobserved, Observed):
+        print("%-12s %.3f" % (cls.__name__, bench(cls) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
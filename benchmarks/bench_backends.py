@@ -0,0 +1,52 @@
+"""Bytes per object for each model backend
+
+Objects have four numeric traits with values. Memory mapped records
+aren't seen by tracemalloc, so their size is added for StructBackend.
+"""
+import tracemalloc
+
+from stately import Stately, Instance
+from stately.base.backends import CompactBackend, SlotsBackend, StructBackend
+
+
+def make_class(backend):
+    return type("Point", (Stately,), {
+        "model_backend": backend,
+        "x": Instance(int),
+        "y": Instance(int),
+        "z": Instance(float),
+        "w": Instance(float),
+    })
+
+
+def bench(backend, number=10000):
+    cls = make_class(backend)
+    cls()  # compute any per-class layout up front
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = []
+    for i in range(number):
+        obj = cls()
+        obj.x, obj.y, obj.z, obj.w = i, i, float(i), float(i)
+        kept.append(obj._model)
+        # only the models are kept, in order to measure them alone
+        del obj
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    # less the list which keeps the models
+    size -= 8 * number
+    if isinstance(backend, StructBackend):
+        size += kept[0].arena.record.size * number
+    return size / number
+
+
+def main():
+    print("%-16s %s" % ("backend", "bytes/model"))
+    for backend in (None, CompactBackend(), SlotsBackend(), StructBackend()):
+        name = "dict" if backend is None else type(backend).__name__
+        print("%-16s %.0f" % (name, bench(backend)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Cost of constructing Stately objects
+
+Measures how instantiation scales with the number of traits
+on a class and with the depth of its inheritance hierarchy.
+"""
+import timeit
+
+from stately import Stately, Instance
+
+
+def make_class(traits, depth):
+    cls = Stately
+    per_level = max(1, traits // depth)
+    count = 0
+    for level in range(depth):
+        classdict = {}
+        for i in range(per_level):
+            if count < traits:
+                classdict["t%s" % count] = Instance(int)
+                count += 1
+        cls = type("Level%s" % level, (cls,), classdict)
+    return cls
+
+
+def bench(traits, depth, number=10000):
+    cls = make_class(traits, depth)
+    return min(timeit.repeat(cls, number=number, repeat=3)) / number
+
+
+def main():
+    print("%-8s %-8s %s" % ("traits", "depth", "usec/object"))
+    for traits in (1, 10, 50):
+        for depth in (1, 5, 10):
+            print("%-8s %-8s %.2f" % (traits, depth, bench(traits, depth) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
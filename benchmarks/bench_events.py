@@ -0,0 +1,87 @@
+"""Memory and time spent on events for observed trait assignments
+
+Compares the size of the slotted built-in Set event against an
+equivalent event with a __dict__, and the time and transient memory
+of an observed assignment which makes either kind of event.
+"""
+import sys
+import timeit
+import tracemalloc
+
+from stately import Stately, Trait, Instance
+
+
+class DictSet(Trait.Set):
+    # subclasses without __slots__ get a __dict__
+    pass
+
+
+class DictInstance(Instance):
+
+    Set = DictSet
+
+
+class Observed(Stately):
+
+    x = Instance(int)
+    y = DictInstance(int)
+
+    def __init__(self):
+        super(Observed, self).__init__()
+        self.observe(("x", "y"), observer=lambda obj, event: None)
+
+
+def sizeof(event):
+    size = sys.getsizeof(event)
+    if hasattr(event, "__dict__"):
+        size += sys.getsizeof(event.__dict__)
+    return size
+
+
+def bench_size():
+    trait = Observed.x
+    result = {}
+    for etype in (Trait.Set, DictSet):
+        event = etype(trait, new=1)
+        event.old = 0
+        result[etype.__name__] = sizeof(event)
+    return result
+
+
+def bench_assign(name, number=100000):
+    obj = Observed()
+    def assign():
+        setattr(obj, name, 1)
+    return min(timeit.repeat(assign, number=number, repeat=3)) / number
+
+
+def bench_memory(name, number=1000):
+    """Peak bytes allocated while making one observed assignment (Python 3.9+)"""
+    obj = Observed()
+    setattr(obj, name, 0)
+    tracemalloc.start()
+    try:
+        peaks = []
+        for i in range(number):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            setattr(obj, name, 1)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / float(number)
+
+
+def main():
+    print("%-10s %s" % ("event", "bytes"))
+    for name, size in bench_size().items():
+        print("%-10s %s" % (name, size))
+    print()
+    print("%-10s %-16s %s" % ("event", "usec/assignment", "peak bytes/assignment"))
+    for name, etype in (("x", Trait.Set), ("y", DictSet)):
+        print("%-10s %-16.3f %.1f" % (etype.__name__,
+            bench_assign(name) * 1e6, bench_memory(name)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Throughput of recording events to a journal and rebuilding objects from it
+
+Recording should stay within a small multiple of an observed assignment,
+and replay should restore well over a million records per second.
+"""
+import os
+import time
+import tempfile
+
+from stately import Stately, Instance
+from stately.journal import Journal, rebuild
+
+
+class Point(Stately):
+    x = Instance(int)
+    y = Instance(int)
+
+
+def bench_record(path, objects, assignments):
+    points = [Point() for i in range(objects)]
+    start = time.perf_counter()
+    with Journal(path) as journal:
+        for i, p in enumerate(points):
+            journal.track(p, i)
+        for n in range(assignments):
+            for p in points:
+                p.x = n
+    return time.perf_counter() - start
+
+
+def bench_replay(path):
+    start = time.perf_counter()
+    rebuild(path, lambda key: Point())
+    return time.perf_counter() - start
+
+
+def main():
+    print("%-10s %-14s %-16s %s" % ("objects", "records", "record/sec", "replay/sec"))
+    for objects, assignments in ((10, 10000), (1000, 100)):
+        fd, path = tempfile.mkstemp(suffix=".journal")
+        os.close(fd)
+        try:
+            records = objects * (assignments + 1)
+            recording = bench_record(path, objects, assignments)
+            replaying = bench_replay(path)
+        finally:
+            os.remove(path)
+        print("%-10s %-14s %-16.0f %.0f" % (objects, records,
+            records / recording, records / replaying))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Cost of observer dispatch as the number of observers grows
+
+Times the raw ObserverMapping lookup for an event, a full trait
+assignment which notifies every observer of the trait, and
+attaching then detaching one more observer.
+"""
+import timeit
+
+from stately import Stately, Instance
+
+
+class Observed(Stately):
+
+    x = Instance(int)
+
+
+def setup(observers):
+    obj = Observed()
+    for i in range(observers):
+        # distinct callables so none are deduplicated
+        obj.observe("x", observer=lambda obj, event: None)
+    return obj
+
+
+def bench_lookup(observers, number=100000):
+    obj = setup(observers)
+    event = Observed.x.event("Set", new=1)
+    get = obj._observers.get
+    return min(timeit.repeat(lambda: get(event), number=number, repeat=3)) / number
+
+
+def bench_assign(observers, number=2000):
+    obj = setup(observers)
+    def assign():
+        obj.x = 1
+    return min(timeit.repeat(assign, number=number, repeat=3)) / number
+
+
+def bench_churn(observers, number=10000):
+    obj = setup(observers)
+    def churn():
+        obj.observe("x", observer=lambda obj, event: None).remove()
+    return min(timeit.repeat(churn, number=number, repeat=3)) / number
+
+
+def main():
+    print("%-10s %-14s %-18s %s" % ("observers", "usec/lookup",
+        "usec/assignment", "usec/attach+detach"))
+    for observers in (1, 10, 1000):
+        print("%-10s %-14.3f %-18.3f %.3f" % (observers,
+            bench_lookup(observers) * 1e6,
+            bench_assign(observers) * 1e6,
+            bench_churn(observers) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Memory and assignment cost of a StatelyTable against separate objects"""
+import timeit
+import tracemalloc
+
+from stately import Stately, StatelyTable, Instance
+
+
+class Reading(Stately):
+
+    value = Instance(float)
+    count = Instance(int)
+
+
+def memory(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(s.size_diff for s in after.compare_to(before, "filename")), kept
+
+
+def bench_memory(rows):
+    def objects():
+        result = []
+        for i in range(rows):
+            r = Reading()
+            r.value, r.count = float(i), i
+            result.append(r)
+        return result
+    def table():
+        return StatelyTable(Reading, (dict(value=float(i), count=i) for i in range(rows)))
+    return memory(objects)[0] / rows, memory(table)[0] / rows
+
+
+def bench_assign(rows, number=10):
+    objects = [Reading() for i in range(rows)]
+    table = StatelyTable(Reading, (dict(count=0) for i in range(rows)))
+    values = list(range(rows))
+    def each():
+        for o, v in zip(objects, values):
+            o.count = v
+    def column():
+        table.assign("count", values)
+    return (min(timeit.repeat(each, number=number, repeat=3)) / number,
+        min(timeit.repeat(column, number=number, repeat=3)) / number)
+
+
+def main():
+    rows = 10000
+    print("%s rows" % rows)
+    objects, table = bench_memory(rows)
+    print("%-10s %-12s %s" % ("storage", "bytes/row", "msec/column assignment"))
+    each, column = bench_assign(rows)
+    print("%-10s %-12.0f %.2f" % ("objects", objects, each * 1e3))
+    print("%-10s %-12.0f %.2f" % ("table", table, column * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Throughput of a ThreadSafeStately object shared between threads
+
+Each thread assigns an observed trait of the same object while
+another observer is repeatedly attached and detached.
+"""
+import time
+import threading
+
+from stately import ThreadSafeStately, Instance
+
+
+class Shared(ThreadSafeStately):
+
+    x = Instance(int)
+
+
+def bench(threads, assignments=20000):
+    obj = Shared()
+    counts = []
+    obj.observe("x", observer=lambda obj, event: counts.append(1))
+    stop = threading.Event()
+
+    def churn():
+        while not stop.is_set():
+            obj.observe("x", observer=lambda obj, event: None).remove()
+
+    def work():
+        for i in range(assignments // threads):
+            obj.x = i
+
+    churner = threading.Thread(target=churn)
+    churner.start()
+    workers = [threading.Thread(target=work) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    churner.join()
+    assert len(counts) == (assignments // threads) * threads
+    return len(counts) / elapsed
+
+
+def main():
+    print("%-8s %s" % ("threads", "assignments/sec"))
+    for threads in (1, 2, 4, 8):
+        print("%-8s %.0f" % (threads, bench(threads)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Cost of assigning to a Union trait
+
+The value matches the last member, so every other member must
+be ruled out first.
+"""
+import timeit
+
+from stately import Stately, Instance
+
+
+class Unioned(Stately):
+
+    x = Instance(str) | Instance(bytes) | Instance(float) | Instance(int)
+
+
+class Single(Stately):
+
+    x = Instance(int)
+
+
+def bench(cls, number=100000):
+    obj = cls()
+    def assign():
+        obj.x = 1
+    return min(timeit.repeat(assign, number=number, repeat=3)) / number
+
+
+def main():
+    print("%-10s %s" % ("trait", "usec/assignment"))
+    for cls in (Single, Unioned):
+        print("%-10s %.3f" % (cls.__name__, bench(cls) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Cost of hydrating an object's traits one at a time or with update()"""
+import timeit
+
+from stately import Stately, Instance
+
+
+def make_class(traits):
+    classdict = {"t%s" % i: Instance(int) for i in range(traits)}
+    return type("Row%s" % traits, (Stately,), classdict)
+
+
+def bench(traits, bulk, number=2000):
+    obj = make_class(traits)()
+    row = {"t%s" % i: i for i in range(traits)}
+    if bulk:
+        def hydrate():
+            obj.update(**row)
+    else:
+        def hydrate():
+            for k, v in row.items():
+                setattr(obj, k, v)
+    return min(timeit.repeat(hydrate, number=number, repeat=3)) / number
+
+
+def main():
+    print("%-8s %-14s %s" % ("traits", "usec/setattr", "usec/update"))
+    for traits in (1, 10, 100):
+        print("%-8s %-14.2f %.2f" % (traits,
+            bench(traits, False) * 1e6,
+            bench(traits, True) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Run the benchmark suite and store its results as JSON
+
+Usage::
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py -o new.json --compare old.json
+    python benchmarks/run.py -k observers
+
+Each case is timed with :mod:`timeit`, taking the best of several repeats,
+and results are recorded in seconds per call along with the interpreter,
+platform, and git commit they were measured with. Cases which use an API
+the tree doesn't have, as when comparing against an older commit, are
+reported as "n/a" and left out of the results.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import subprocess
+from collections import OrderedDict
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(here))
+
+from stately import Stately, Trait, Instance
+from stately.stately import ObserverMapping
+
+
+# ---------------------------------------------------------------
+# Benchmark Cases -----------------------------------------------
+# ---------------------------------------------------------------
+
+# Each case is a function that does its setup and returns
+# the callable that gets timed, along with the number of
+# times that callable should be called per repeat.
+
+cases = OrderedDict()
+
+
+def case(name, number=10000):
+
+    def setup(function):
+        cases[name] = (function, number)
+        return function
+
+    return setup
+
+
+class Point(Stately):
+
+    x = Instance(int)
+    y = Instance(int)
+    z = Instance(int)
+
+
+def mixed():
+    # unions of three traits can't be built by some older commits,
+    # so this is made by the cases which use it, not on import
+
+    class Mixed(Stately):
+
+        value = Instance(int) | Instance(str) | Instance(float)
+
+    return Mixed()
+
+
+@case("construction")
+def construction():
+    return Point
+
+
+@case("construction_with_values")
+def construction_with_values():
+    def construct():
+        p = Point()
+        p.update(x=1, y=2, z=3)
+    return construct
+
+
+@case("get", number=100000)
+def get():
+    p = Point()
+    p.x = 1
+    return lambda: p.x
+
+
+@case("set", number=100000)
+def set_():
+    p = Point()
+    def assign():
+        p.x = 1
+    return assign
+
+
+@case("set_observed", number=50000)
+def set_observed():
+    p = Point()
+    p.observe("x", observer=lambda obj, event: None)
+    def assign():
+        p.x = 1
+    return assign
+
+
+@case("set_observed_many", number=10000)
+def set_observed_many():
+    p = Point()
+    for i in range(50):
+        p.observe("x", observer=lambda obj, event: None)
+    def assign():
+        p.x = 1
+    return assign
+
+
+@case("union_first_member", number=50000)
+def union_first_member():
+    m = mixed()
+    def assign():
+        m.value = 1
+    return assign
+
+
+@case("union_last_member", number=50000)
+def union_last_member():
+    m = mixed()
+    def assign():
+        m.value = 1.5
+    return assign
+
+
+@case("delayed_events_replay", number=2000)
+def delayed_events_replay():
+    p = Point()
+    p.observe("x", observer=lambda obj, event: None)
+    def replay():
+        with p.delayed_events():
+            for i in range(10):
+                p.x = i
+    return replay
+
+
+@case("observer_mapping_add", number=2000)
+def observer_mapping_add():
+    observer = lambda obj, event: None
+    def add():
+        mapping = ObserverMapping()
+        mapping.add("x", Trait.Set.typename, None, observer)
+    return add
+
+
+@case("observer_mapping_get", number=100000)
+def observer_mapping_get():
+    p = Point()
+    for i in range(10):
+        p.observe("x", observer=lambda obj, event: None)
+    event = Point.x.event("Set", new=1)
+    get = p._observers.get
+    return lambda: get(event)
+
+
+@case("engine_crank", number=20000)
+def engine_crank():
+    p = Point()
+    trait = Point.x
+
+    def crank():
+        event = trait.event("Set", new=1)
+        turn = event.crank(p)
+        try:
+            while True:
+                turn()
+        except StopIteration:
+            pass
+
+    return crank
+
+
+@case("application_settings", number=200)
+def application_settings():
+    from stately.app.application import Application
+
+    class Bench(Application):
+        name = "bench"
+
+    def load():
+        Bench.env_settings()
+        Bench.cli_argparser()
+
+    return load
+
+
+# ---------------------------------------------------------------
+# Running and Recording -----------------------------------------
+# ---------------------------------------------------------------
+
+
+def measure(function, number, repeat):
+    timed = function()
+    times = [t / number for t in timeit.repeat(timed, number=number, repeat=repeat)]
+    mean = sum(times) / len(times)
+    stdev = (sum((t - mean) ** 2 for t in times) / len(times)) ** 0.5
+    return OrderedDict([("best", min(times)), ("mean", mean),
+        ("stdev", stdev), ("number", number), ("repeat", repeat)])
+
+
+def metadata():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"],
+            cwd=here, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return OrderedDict([
+        ("commit", commit),
+        ("python", platform.python_version()),
+        ("implementation", platform.python_implementation()),
+        ("platform", platform.platform()),
+        ("time", time.strftime("%Y-%m-%dT%H:%M:%S")),
+    ])
+
+
+def run(names, repeat=5, scale=1.0):
+    results = OrderedDict()
+    for name in names:
+        function, number = cases[name]
+        try:
+            results[name] = measure(function, max(1, int(number * scale)), repeat)
+        except ImportError as e:
+            # optional dependencies, like those of the application
+            print("%-28s skipped (%s)" % (name, e))
+            continue
+        except (AttributeError, TypeError) as e:
+            # an API the case uses is missing, as in an older commit
+            print("%-28s %10s      (%s)" % (name, "n/a", e))
+            continue
+        print("%-28s %10.3f usec" % (name, results[name]["best"] * 1e6))
+    return results
+
+
+def compare(results, path):
+    with open(path) as f:
+        baseline = json.load(f)["benchmarks"]
+    print("\n%-28s %12s %12s %8s" % ("case", "old usec", "new usec", "ratio"))
+    for name, result in results.items():
+        if name in baseline:
+            old, new = baseline[name]["best"], result["best"]
+            print("%-28s %12.3f %12.3f %8.2f" % (name, old * 1e6, new * 1e6, new / old))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the stately benchmark suite")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("-c", "--compare", help="compare against results in this JSON file")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="repeats per case")
+    parser.add_argument("-s", "--scale", type=float, default=1.0, help="scale calls per repeat")
+    args = parser.parse_args(argv)
+
+    names = [n for n in cases if args.filter in n]
+    results = run(names, args.repeat, args.scale)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(OrderedDict([("meta", metadata()), ("benchmarks", results)]), f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from .traits import Trait, Event, Type, Subclass, Instance, Undefined
-from .stately import Stately, All, observe, condition
+from .stately import Stately, AsyncStately, ThreadSafeStately, All, observe, condition
+from .table import StatelyTable
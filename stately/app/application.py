@@ -1,5 +1,6 @@
 import os
 import ast
+import sys
 import copy
 import logging
 from metasetup import Settings, ArgumentParser
@@ -47,15 +48,30 @@ class Application(Singleton):
 
     @observe(change, "logger_level")
     def _update_logger_level(self, event):
-        self.logger.setLevel(event.new)
-
-    @observe(change, {"log": lambda tag: instance(tag, (str, int))})
+        if event.new is None:
+            # the level is unset, as when LOG_LEVEL is missing
+            return
+        logger = self.logger
+        logger.setLevel(event.new)
+        if sys.version_info >= (3, 7):
+            # loggers cache the results of `isEnabledFor` since 3.7, but
+            # `setLevel` only clears the caches of loggers made by the
+            # logging manager through `getLogger` - not this one
+            logger._cache.clear()
+
+    @observe(change, {"log": lambda tag: isinstance(tag, (str, int))})
     def _log_event(self, event):
-        level = getattr(event, "level", "debug")
-        self.log(level, event.info())
+        logger = self.logger
+        level = log_level(event.trait.tags.log)
+        if logger.isEnabledFor(level):
+            # the description is only formatted if a handler emits it, and
+            # its attributes are passed along for structured handlers
+            description = event.description()
+            logger.log(level, "%s", description,
+                extra={"stately_event": description.attributes})
 
     def log(self, level, msg, *args, **kwargs):
-        self.logger.log(level, msg, *args, **kwargs)
+        self.logger.log(log_level(level), msg, *args, **kwargs)
 
     
     # -------------------------------------------------------
@@ -153,6 +169,16 @@ class Application(Singleton):
         return (l[1] for l in class_attribute_lineage(cls, name, base=base))
 
 
+def log_level(level):
+    """Convert level names like ``"debug"`` to their number"""
+    if isinstance(level, str):
+        number = logging.getLevelName(level.upper())
+        if not isinstance(number, int):
+            raise ValueError("Unknown logging level %r" % level)
+        return number
+    return level
+
+
 def logger():
     if Application.exists():
         return Application.instance().logger
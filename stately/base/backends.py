@@ -0,0 +1,310 @@
+import mmap
+import struct
+import weakref
+from collections.abc import MutableMapping
+
+from .model import Undefined
+
+
+# ---------------------------------------------------------------
+# Model Backends ------------------------------------------------
+# ---------------------------------------------------------------
+
+# An object's model is created by calling the ``model_backend`` of its
+# class with the object. The default backend is ``dict``, but any mapping
+# of trait names to values will do. The backends below trade the speed
+# of a dict for fewer bytes per object.
+
+
+class Backend(object):
+    """Creates models which share a layout computed once per class
+
+    Layouts are recomputed when traits are added to or removed from a class.
+    """
+
+    def __init__(self):
+        self._layouts = weakref.WeakKeyDictionary()
+
+    def __call__(self, obj):
+        cls = type(obj)
+        descriptors = cls._descriptors_
+        cached = self._layouts.get(cls)
+        if cached is None or cached[0] is not descriptors:
+            cached = self._layouts[cls] = (descriptors, self.layout(cls))
+        return self.model(cached[1])
+
+    def layout(self, cls):
+        raise NotImplementedError()
+
+    def model(self, layout):
+        raise NotImplementedError()
+
+
+class ModelMapping(MutableMapping):
+    """A base for models which store values in something other than a dict"""
+
+    __slots__ = ()
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __len__(self):
+        return sum(1 for name in self)
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, dict(self))
+
+
+# Shared Keys
+# -----------
+
+
+class CompactBackend(Backend):
+    """Stores values in a list whose indices are shared by every object of a class
+
+    Names which are not traits of the class are kept in an overflow dict.
+    """
+
+    def layout(self, cls):
+        return {name: i for i, name in enumerate(cls.trait_names())}
+
+    def model(self, layout):
+        return CompactModel(layout)
+
+
+class CompactModel(ModelMapping):
+
+    __slots__ = ("layout", "values", "overflow")
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.values = [Undefined] * len(layout)
+        self.overflow = None
+
+    def __getitem__(self, name):
+        index = self.layout.get(name)
+        if index is None:
+            if self.overflow is None:
+                raise KeyError(name)
+            return self.overflow[name]
+        value = self.values[index]
+        if value is Undefined:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        index = self.layout.get(name)
+        if index is None:
+            if self.overflow is None:
+                self.overflow = {}
+            self.overflow[name] = value
+        else:
+            self.values[index] = value
+
+    def __delitem__(self, name):
+        index = self.layout.get(name)
+        if index is None:
+            if self.overflow is None:
+                raise KeyError(name)
+            del self.overflow[name]
+        elif self.values[index] is Undefined:
+            raise KeyError(name)
+        else:
+            self.values[index] = Undefined
+
+    def __iter__(self):
+        values = self.values
+        for name, index in self.layout.items():
+            if values[index] is not Undefined:
+                yield name
+        if self.overflow is not None:
+            for name in self.overflow:
+                yield name
+
+
+# Slots
+# -----
+
+
+class SlotsBackend(Backend):
+    """Stores values in the slots of a class generated for each class of object
+
+    The generated model has a slot for every trait and no ``__dict__``.
+    """
+
+    def layout(self, cls):
+        names = tuple(cls.trait_names())
+        return type(cls.__name__ + "Model", (SlotsModel,), {
+            "__slots__": tuple(_slot(n) for n in names), "names": names})
+
+    def model(self, layout):
+        return layout()
+
+
+class SlotsModel(ModelMapping):
+
+    __slots__ = ()
+    names = ()
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, _slot(name))
+        except AttributeError:
+            raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        try:
+            setattr(self, _slot(name), value)
+        except AttributeError:
+            raise KeyError("%s has no slot for %r" % (type(self).__name__, name))
+
+    def __delitem__(self, name):
+        try:
+            delattr(self, _slot(name))
+        except AttributeError:
+            raise KeyError(name)
+
+    def __iter__(self):
+        for name in self.names:
+            if hasattr(self, _slot(name)):
+                yield name
+
+
+def _slot(name):
+    # a prefix of "_" would cause names like "_x" to be mangled
+    return "s_" + name
+
+
+# Memory Mapped Structs
+# ---------------------
+
+
+# formats for traits whose values have a fixed size
+formats = {bool: "?", int: "q", float: "d"}
+
+
+class StructBackend(Backend):
+    """Packs fixed size numeric traits into records of a memory mapped arena
+
+    Traits which are exactly ``Instance(bool)``, ``Instance(int)`` or
+    ``Instance(float)`` get a field in a per-class record, along with a byte
+    marking whether it has a value. Integers must fit in 64 bits. Other
+    traits are kept in a dict. Records are freed when their model is.
+    """
+
+    def layout(self, cls):
+        from ..traits import Instance
+        fields, fmt = {}, "="
+        for name, trait in cls.traits().items():
+            datatype = getattr(trait, "datatype", None)
+            if isinstance(trait, Instance) and datatype in formats:
+                fields[name] = (len(fields), struct.calcsize(fmt), formats[datatype], datatype)
+                fmt += formats[datatype]
+        fmt += "%sx" % len(fields)
+        return StructArena(fields, struct.Struct(fmt))
+
+    def model(self, arena):
+        return StructModel(arena)
+
+
+class StructArena(object):
+    """Hands out fixed size records from pages of anonymous memory maps"""
+
+    # the number of records in each page
+    page_size = 4096
+
+    def __init__(self, fields, record):
+        self.fields = fields
+        self.record = record
+        # the presence flags follow the packed fields
+        self.flags = record.size - len(fields)
+        self.pages = []
+        self.free = []
+
+    def allocate(self):
+        if not self.free:
+            size = max(self.record.size, 1)
+            page = mmap.mmap(-1, size * self.page_size)
+            self.pages.append(page)
+            self.free.extend((page, i * size) for i in reversed(range(self.page_size)))
+        page, offset = self.free.pop()
+        # clear any presence flags left by a previous owner
+        page[offset + self.flags:offset + self.record.size] = bytes(len(self.fields))
+        return page, offset
+
+    def release(self, record):
+        self.free.append(record)
+
+
+class StructModel(ModelMapping):
+
+    __slots__ = ("arena", "page", "offset", "overflow")
+
+    def __init__(self, arena, record=None):
+        self.arena = arena
+        if record is None:
+            record = arena.allocate()
+        self.page, self.offset = record
+        self.overflow = None
+
+    def __del__(self):
+        self.arena.release((self.page, self.offset))
+
+    def __getitem__(self, name):
+        field = self.arena.fields.get(name)
+        if field is not None and self.page[self.offset + self.arena.flags + field[0]]:
+            index, position, fmt, datatype = field
+            return struct.unpack_from(fmt, self.page, self.offset + position)[0]
+        elif self.overflow is None:
+            raise KeyError(name)
+        else:
+            return self.overflow[name]
+
+    def __setitem__(self, name, value):
+        field = self.arena.fields.get(name)
+        if field is not None and type(value) is field[3]:
+            index, position, fmt, datatype = field
+            try:
+                struct.pack_into(fmt, self.page, self.offset + position, value)
+            except struct.error:
+                pass
+            else:
+                self.page[self.offset + self.arena.flags + index] = 1
+                if self.overflow is not None:
+                    self.overflow.pop(name, None)
+                return
+        if field is not None:
+            # the value doesn't fit into the field
+            self.page[self.offset + self.arena.flags + field[0]] = 0
+        if self.overflow is None:
+            self.overflow = {}
+        self.overflow[name] = value
+
+    def __delitem__(self, name):
+        field = self.arena.fields.get(name)
+        if field is not None and self.page[self.offset + self.arena.flags + field[0]]:
+            self.page[self.offset + self.arena.flags + field[0]] = 0
+        elif self.overflow is not None and name in self.overflow:
+            del self.overflow[name]
+        else:
+            raise KeyError(name)
+
+    def __iter__(self):
+        flags = self.offset + self.arena.flags
+        for name, field in self.arena.fields.items():
+            if self.page[flags + field[0]]:
+                yield name
+        if self.overflow is not None:
+            for name in self.overflow:
+                yield name
@@ -9,11 +9,48 @@ if six.PY3:
 class MetaEngine(type):
 
     def __init__(cls, name, bases, classdict):
-        cls._cycle = []
+        cls.compile()
+
+    def __setattr__(cls, name, value):
+        super(MetaEngine, cls).__setattr__(name, value)
+        if name == "blueprint" or name in cls._cycle:
+            cls._recompile()
+
+    def __delattr__(cls, name):
+        super(MetaEngine, cls).__delattr__(name)
+        if name == "blueprint" or name in cls._cycle:
+            cls._recompile()
+
+    def _recompile(cls):
+        # stages of this class and its subclasses may have changed
+        stack = [cls]
+        while stack:
+            c = stack.pop()
+            c.compile()
+            stack.extend(c.__subclasses__())
+
+    def compile(cls):
+        """Resolve the blueprint into a cycle of statuses and a pipeline of stages
+
+        The pipeline is a tuple of ``(status, function)`` pairs for each status
+        in the cycle that has a method. Each function accepts the engine as its
+        first argument, so running a stage requires no attribute lookups.
+        """
+        cycle = []
         rotation = cls.next_rotation(None)
         while rotation is not None:
-            cls._cycle.append(rotation)
+            cycle.append(rotation)
             rotation = cls.next_rotation(rotation)
+        pipeline = []
+        for status in cycle:
+            # static methods are unwrapped by getattr
+            method = inspect.getattr_static(cls, status, None)
+            if inspect.isfunction(method):
+                pipeline.append((status, method))
+            elif method is not None:
+                pipeline.append((status, _stage(status)))
+        type.__setattr__(cls, "_cycle", tuple(cycle))
+        type.__setattr__(cls, "_pipeline", tuple(pipeline))
 
     def next_rotation(cls, rotation):
         for c in cls.mro():
@@ -21,14 +58,24 @@ class MetaEngine(type):
                 return c.blueprint[rotation]
 
 
+def _stage(status):
+    # stages which aren't plain functions (e.g. static
+    # methods) must be looked up on the engine when run
+    def stage(self, *args, **kwargs):
+        return getattr(self, status)(*args, **kwargs)
+    return stage
+
+
 class Engine(object, metaclass=MetaEngine):
 
+    __slots__ = ()
+
     status = None
     blueprint = {None: None}
 
     @property
     def cycle(self):
-        return self._cycle[:]
+        return list(self._cycle)
 
     def crank(self, *args, **kwargs):
         generator = self(*args, **kwargs)
@@ -47,13 +94,66 @@ class Engine(object, metaclass=MetaEngine):
                 outcome.append(result)
             return outcome
 
+    def execute(self, statuses, notify, *args, stage=None, **kwargs):
+        """Run the cycle to completion without suspending between stages
+
+        Parameters
+        ----------
+        statuses: set
+            The statuses after which ``notify`` should be called.
+        notify: callable
+            Called with this engine after the stages named in ``statuses``.
+        stage: callable or None
+            If given, each stage is run by calling ``stage(method, self,
+            *args, **kwargs)`` rather than the method itself - for example
+            to time it. The current stage is this engine's ``status``.
+
+        Returns the last result of a stage which was not None.
+        """
+        if self.status is None:
+            result = None
+            for status, method in self._pipeline:
+                self.status = status
+                if stage is None:
+                    _result = method(self, *args, **kwargs)
+                else:
+                    _result = stage(method, self, *args, **kwargs)
+                if _result is not None:
+                    result = _result
+                if status in statuses:
+                    notify(self)
+            self.status = None
+            return result
+        else:
+            raise RuntimeError("%r is already in progress." % self)
+
+    if six.PY3:
+
+        async def execute_async(self, statuses, notify, *args, **kwargs):
+            """Like :meth:`execute` but awaits stages and notifications which are awaitable"""
+            if self.status is None:
+                result = None
+                for status, method in self._pipeline:
+                    self.status = status
+                    _result = method(self, *args, **kwargs)
+                    if inspect.isawaitable(_result):
+                        _result = await _result
+                    if _result is not None:
+                        result = _result
+                    if status in statuses:
+                        outcome = notify(self)
+                        if inspect.isawaitable(outcome):
+                            await outcome
+                self.status = None
+                return result
+            else:
+                raise RuntimeError("%r is already in progress." % self)
+
     def __call__(self, *args, **kwargs):
         if self.status is None:
-            for status in self.cycle:
+            for status, method in self._pipeline:
                 self.status = status
-                method = getattr(self, status, None)
-                if method is not None:
-                    args = ((yield method(*args, **kwargs)) or args)
+                args = ((yield method(self, *args, **kwargs)) or args)
             self.status = None
         else:
             raise RuntimeError("%r is already in progress." % self)
@@ -126,6 +226,16 @@ async def run_futures(engine, *args, **kwargs):
 # ---------------------------------------------------------------
 
 
+def _lineage_slots(cls):
+    for c in reversed(cls.mro()):
+        slots = c.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name != "__weakref__":
+                yield name
+
+
 class MetaEventModel(MetaEngine):
 
     def __init__(cls, name, bases, classdict):
@@ -139,9 +249,14 @@ class MetaEventModel(MetaEngine):
         cls.typename_lineage = tuple(" ".join(reversed(cls.subtypename_lineage[:i]))
             for i in range(1, len(cls.subtypename_lineage) + 1))
         cls.typename = cls.typename_lineage[-1]
+        cls._slot_names = tuple(_lineage_slots(cls))
 
 
 class EventModel(Engine, metaclass=MetaEventModel):
+
+    # subclasses may define slots to avoid
+    # the cost of a per-instance __dict__
+    __slots__ = ()
     
     blueprint = {
         None: "pending",
@@ -154,20 +269,55 @@ class EventModel(Engine, metaclass=MetaEventModel):
     subtypename_lineage = []
 
     def __init__(self, **attrs):
+        self.status = None
         for k, v in attrs.items():
             setattr(self, k, v)
 
     def rollback(self):
         pass
 
+    def attributes(self):
+        """Get a dict of this event's public attributes"""
+        info = {}
+        for k in self._slot_names:
+            if not k.startswith("_") and hasattr(self, k):
+                info[k] = getattr(self, k)
+        for k, v in getattr(self, "__dict__", {}).items():
+            if not k.startswith("_"):
+                info[k] = v
+        return info
+
     def info(self):
         return repr(self)
 
+    def description(self):
+        """Get an :class:`EventDescription` which is formatted when converted to a string"""
+        return EventDescription(self)
+
     def __repr__(self):
-        info = {}
-        for k, v in vars(self).items():
-            if not k.startswith("_"):
-                info[k] = v
-        cls = type(self)
-        name = cls.__module__ + "." + cls.__name__
-        return "%s(%s)" % (name, str(info)[1:-1])
+        return str(EventDescription(self))
+
+
+class EventDescription(object):
+    """A snapshot of an event's attributes which formats them lazily
+
+    Events change as they advance, so their attributes are copied when
+    this is created. The text is only rendered, and then cached, the first
+    time it is converted to a string.
+    """
+
+    __slots__ = ("name", "attributes", "_text")
+
+    def __init__(self, event):
+        cls = type(event)
+        self.name = cls.__module__ + "." + cls.__name__
+        self.attributes = event.attributes()
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = "%s(%s)" % (self.name, str(self.attributes)[1:-1])
+        return self._text
+
+    __repr__ = __str__
+
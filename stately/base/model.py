@@ -1,7 +1,5 @@
 import sys
 import types
-import inspect
-from inspect import getmembers
 from contextlib import contextmanager
 from metasetup import MetaConfigurable, Configurable, Bunch
 
@@ -12,15 +10,14 @@ Undefined = Sentinel("Undefined", "no value")
 
 
 # ---------------------------------------------------------------
-# Python < 3.6 - PEP 487 Descriptor Compatibility ---------------
+# Descriptor Metaclass - PEP 487 Compatibility & Registry -------
 # ---------------------------------------------------------------
 
-if sys.version_info >= (3, 6):
-    Metaclass = MetaConfigurable
-else:
-    class Metaclass(MetaConfigurable):
-        def __init__(cls, name, bases, classdict):
-            super(Metaclass, cls).__init__(name, bases, classdict)
+class Metaclass(MetaConfigurable):
+
+    def __init__(cls, name, bases, classdict):
+        super(Metaclass, cls).__init__(name, bases, classdict)
+        if sys.version_info < (3, 6):
             # we create an attribute here in order
             # to speed up subclass initialization
             cls._has_descriptors = []
@@ -32,6 +29,38 @@ else:
                 if hasattr(c, "_has_descriptors"):
                     for name in c._has_descriptors:
                         getattr(c, name).__init_subclass__(cls)
+        cls._descriptors_ = cls._find_descriptors()
+
+    def __setattr__(cls, name, value):
+        old = cls.__dict__.get(name)
+        super(Metaclass, cls).__setattr__(name, value)
+        if isinstance(value, Descriptor):
+            # only descriptors in the class body are named automatically
+            value.__set_name__(cls, name)
+        if isinstance(value, Descriptor) or isinstance(old, Descriptor):
+            cls._refresh_descriptors()
+
+    def __delattr__(cls, name):
+        old = cls.__dict__.get(name)
+        super(Metaclass, cls).__delattr__(name)
+        if isinstance(old, Descriptor):
+            cls._refresh_descriptors()
+
+    def _find_descriptors(cls):
+        """Collect the descriptors of this class and its parents, sorted by name"""
+        members = {}
+        for c in reversed(cls.mro()):
+            members.update(vars(c))
+        return tuple((k, v) for k, v in sorted(members.items(), key=lambda i: i[0])
+            if isinstance(v, Descriptor))
+
+    def _refresh_descriptors(cls):
+        """Rebuild the descriptor registry of this class and all its subclasses"""
+        stack = [cls]
+        while stack:
+            c = stack.pop()
+            type.__setattr__(c, "_descriptors_", c._find_descriptors())
+            stack.extend(c.__subclasses__())
 
 
 # ---------------------------------------------------------------
@@ -65,10 +94,14 @@ class Descriptor(object):
 
 class HasDescriptors(Configurable, metaclass=Metaclass):
 
+    # a tuple of (name, descriptor) pairs for the class,
+    # which is precomputed by the metaclass and refreshed
+    # if descriptors are later added, removed, or retagged
+    _descriptors_ = ()
+
     def __init__(self):
-        for k, v in getmembers(type(self)):
-            if isinstance(v, Descriptor):
-                v.__init_instance__(self)
+        for k, v in type(self)._descriptors_:
+            v.__init_instance__(self)
 
 
 # ---------------------------------------------------------------
@@ -103,17 +136,86 @@ class Loadable(HasDescriptors):
 # ---------------------------------------------------------------
 
 
+class TraitIndex(object):
+    """A lookup table for the traits of a class and the names of their tags
+
+    Queries for names with a given set of tags are computed once and then
+    cached, so long as the tag values being matched against are hashable
+    and not callable.
+    """
+
+    def __init__(self, descriptors):
+        self.descriptors = descriptors
+        self.traits = {}
+        self.tagged = {}
+        self.queries = {}
+        for k, v in descriptors:
+            if isinstance(v, TraitModel):
+                self.traits[k] = v
+                for tag, value in v.tags.items():
+                    try:
+                        self.tagged.setdefault((tag, value), []).append(k)
+                    except TypeError:
+                        # unhashable tags can't be looked up
+                        pass
+        # descriptors are sorted by name, which dicts may not preserve
+        self.names = tuple(k for k, v in descriptors if isinstance(v, TraitModel))
+        for key, names in self.tagged.items():
+            self.tagged[key] = tuple(names)
+
+    def names_with(self, **tags):
+        if not tags:
+            return self.names
+        elif any(callable(v) for v in tags.values()):
+            return self._search(tags)
+        try:
+            key = frozenset(tags.items())
+            return self.queries[key]
+        except TypeError:
+            return self._search(tags)
+        except KeyError:
+            result = self.queries[key] = self._search(tags)
+            return result
+
+    def _search(self, tags):
+        if len(tags) == 1:
+            (tag, value), = tags.items()
+            if not callable(value):
+                try:
+                    return self.tagged.get((tag, value), ())
+                except TypeError:
+                    pass
+        traits = self.traits
+        return tuple(n for n in self.names if traits[n].has_tags(**tags))
+
+
 class ObjectModel(Loadable):
 
+    # called with a new object to create its model, which may be any
+    # mutable mapping (see `stately.base.backends`) - a dict if None
+    model_backend = None
+
     def __init__(self, model=None):
         if isinstance(model, ObjectModel):
             model = model._model
-        self._model = model or {}
+        elif model is None:
+            backend = type(self).model_backend
+            model = {} if backend is None else backend(self)
+        self._model = model
         super(ObjectModel, self).__init__()
 
+    @classmethod
+    def trait_index(cls):
+        """Get the :class:`TraitIndex` for this class' current traits"""
+        index = cls.__dict__.get("_trait_index_")
+        if index is None or index.descriptors is not cls._descriptors_:
+            index = TraitIndex(cls._descriptors_)
+            type.__setattr__(cls, "_trait_index_", index)
+        return index
+
     @classmethod
     def has_trait(cls, name):
-        return isinstance(getattr(cls, name, None), TraitModel)
+        return name in cls.trait_index().traits
 
     def trait_values(self, **tags):
         model = {}
@@ -126,28 +228,21 @@ class ObjectModel(Loadable):
     
     @classmethod
     def trait_names(cls, **tags):
-        result = []
-        for k, v in inspect.getmembers(cls):
-            if isinstance(v, TraitModel) and v.has_tags(**tags):
-                result.append(k)
-        return result
+        return cls.trait_index().names_with(**tags)
     
     @classmethod
     def trait_defaults(cls, **tags):
         model = {}
         for k, t in cls.traits(**tags).items():
-            default = t.default
+            default = t.default()
             if default is not Undefined:
                 model[k] = default
-        return state
+        return model
     
     @classmethod
     def traits(cls, **tags):
-        result = {}
-        for k, v in inspect.getmembers(cls):
-            if isinstance(v, TraitModel) and v.tags_match(**tags):
-                result[k] = v
-        return result
+        traits = cls.trait_index().traits
+        return {n: traits[n] for n in cls.trait_names(**tags)}
 
 
 # ---------------------------------------------------------------
@@ -156,8 +251,71 @@ class ObjectModel(Loadable):
 
 
 class TraitError(Exception):
-    """An error raise in relation to a TraitModel"""
-    pass
+    """An error raise in relation to a TraitModel
+
+    Instead of a message, a function that renders one may be given along
+    with its arguments. It's only called once the error is displayed, or
+    its ``args`` are read, so errors that are caught and recovered from
+    never format any text.
+    """
+
+    def __init__(self, *args):
+        if args and callable(args[0]):
+            self._render = args
+            super(TraitError, self).__init__()
+        else:
+            self._render = None
+            super(TraitError, self).__init__(*args)
+
+    def _rendered(self):
+        if self._render is not None:
+            render, args = self._render[0], self._render[1:]
+            self._render = None
+            BaseException.args.__set__(self, (render(*args),))
+
+    @property
+    def args(self):
+        self._rendered()
+        return BaseException.args.__get__(self)
+
+    @args.setter
+    def args(self, value):
+        self._render = None
+        BaseException.args.__set__(self, value)
+
+    def __str__(self):
+        self._rendered()
+        return super(TraitError, self).__str__()
+
+    def __repr__(self):
+        self._rendered()
+        return super(TraitError, self).__repr__()
+
+    def __reduce__(self):
+        return type(self), self.args
+
+
+def unwritable_message(obj, name):
+    return "%s's %r attribute is not writable" % (describe("An", obj, "object"), name)
+
+
+def rejected_message(obj, name, expected, val=Undefined):
+    """Describe a value rejected by a trait, given a function describing ``expected`` values"""
+    text = "%s's %r attribute can be %s" % (describe("An", obj, "object"), name, expected())
+    if val is not Undefined:
+        text += ", not %s" % describe("the", val)
+    return text
+
+
+# defaults of these types may be shared by every instance
+immutable_types = frozenset([int, float, complex, bool, str,
+    bytes, frozenset, type(None), type(Undefined)])
+
+
+def is_immutable(value):
+    if type(value) is tuple:
+        return all(is_immutable(v) for v in value)
+    return type(value) in immutable_types
 
 
 class TraitModel(Descriptor):
@@ -165,9 +323,16 @@ class TraitModel(Descriptor):
     tags = {
         "writable": True,
         "allow_none": False,
+        # emit an event when a default is first stored
+        "default_event": False,
+        # None shares immutable defaults made by the class'
+        # constructor, True shares any immutable default not
+        # made by a named method of the owner
+        "cache_default": None,
     }
 
     constructor = None
+    _default_cache = Undefined
 
     def __init__(self, constructor=None, *args, **kwargs):
         if constructor is not None:
@@ -175,6 +340,24 @@ class TraitModel(Descriptor):
         self.constructor_args = (args, kwargs)
         self.tags = Bunch(self.__class__.tags)
 
+    def cached_default(self, obj=None):
+        """Get a default, computing it only once if it's immutable and may be shared"""
+        default = self._default_cache
+        if default is not Undefined:
+            return default
+        default = self.default(obj)
+        if isinstance(self.constructor, str):
+            # named methods of the owner depend on the object
+            return default
+        cache = self.tags.cache_default
+        if cache is None:
+            # constructors given to the trait might
+            # not return the same value twice
+            cache = "constructor" not in vars(self)
+        if cache and is_immutable(default) and default is not Undefined:
+            self._default_cache = default
+        return default
+
     def default(self, obj=None):
         if self.constructor is not None:
             args, kwargs = self.constructor_args
@@ -187,22 +370,29 @@ class TraitModel(Descriptor):
 
     def tag(self, **tags):
         self.tags.update(**tags)
+        self._default_cache = Undefined
+        owner = getattr(self, "owner", None)
+        if owner is not None:
+            # tag lookups of the owner are now stale
+            owner._refresh_descriptors()
         return self
 
     def has_tags(self, **tags):
         my_tags = self.tags
         for k, v in tags.items():
-            if k in my_tags:
-                if callable(v) and not v(my_tags[k]):
-                    return False
-                elif v != my_tags[k]:
+            if k not in my_tags:
+                return False
+            elif callable(v):
+                if not v(my_tags[k]):
                     return False
+            elif v != my_tags[k]:
+                return False
         else:
-            return tags == my_tags
+            return True
 
     def info(self):
         info = "any value"
-        if not self.allow_none:
+        if not self.tags.allow_none:
             info += " except None"
         return info
 
@@ -219,22 +409,19 @@ class TraitModel(Descriptor):
         if self.tags.writable:
             if val is None:
                 if self.tags.allow_none:
-                    self.model(obj)[self.name] = val
+                    self.set_value(obj, val)
                 else:
-                    raise TraitError("%s's %r attribute can be %s"
-                        % (describe("An", obj, "object"), self.name, self.info()))
+                    raise TraitError(rejected_message, obj, self.name, self.info)
             else:
                 self.set_value(obj, val)
         else:
-            raise TraitError("%s's %r attribute is not writable"
-                % (describe("An", obj, "object"), self.name))
+            raise TraitError(unwritable_message, obj, self.name)
 
     def __delete__(self, obj):
         if self.tags.writable:
             self.del_value(obj)
         else:
-            raise TraitError("%s's %r attribute is not writable"
-                % (describe("An", obj, "object"), self.name))
+            raise TraitError(unwritable_message, obj, self.name)
 
     # Methods To Overrite In Subclasses
     # ---------------------------------
@@ -246,9 +433,19 @@ class TraitModel(Descriptor):
             # just in time default generation generally
             # occurs when information about an object is
             # required to generate the default of a trait
-            default = self.default(obj)
-            self.set_value(obj, default)
-            return default
+            if self.tags.default_event:
+                default = self.default(obj)
+                self.set_value(obj, default)
+                return default
+            else:
+                return self.populate_default(obj)
+
+    def populate_default(self, obj):
+        """Store and return an object's default without emitting an event
+
+        If another thread stored a value first, that value is returned instead.
+        """
+        return self.model(obj).setdefault(self.name, self.cached_default(obj))
 
     def set_value(self, obj, val):
         self.model(obj)[self.name] = val
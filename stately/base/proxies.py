@@ -38,6 +38,7 @@ class ProxyManyDescriptors(TraitModel):
         return self._descriptors[:]
 
     def __set_name__(self, cls, name):
+        super(ProxyManyDescriptors, self).__set_name__(cls, name)
         for d in self._descriptors:
             d.__set_name__(cls, name)
 
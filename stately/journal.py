@@ -0,0 +1,214 @@
+import io
+import struct
+import pickle
+
+from .utils import ErrorGroup
+from .traits import Trait, Union
+from .base.model import Undefined
+
+
+# ---------------------------------------------------------------
+# Append Only Event Journal -------------------------------------
+# ---------------------------------------------------------------
+
+# A journal is a sequence of frames, each holding a batch of records
+# pickled together so that repeated keys and trait names are memoized.
+# Every record is an (operation, key, name, value) tuple.
+
+FRAME = struct.Struct("=II")
+
+SET = 0
+DEL = 1
+SNAPSHOT = 2
+
+
+class Journal(object):
+    """Record the completed events of :class:`~stately.Stately` objects to a file
+
+    If the file already ends with a frame left incomplete by an interrupted
+    write, it's truncated so that the frames appended after it can be read.
+
+    Parameters
+    ----------
+    path: str
+        The file that records are appended to.
+    batch_size: int
+        The number of records held before they are written as one frame.
+    snapshot_interval: int or None
+        After this many records for one object, its :meth:`trait_values`
+        are recorded again so replay may discard what came before.
+    buffering: int
+        The size of the file's write buffer.
+    """
+
+    def __init__(self, path, batch_size=1024, snapshot_interval=None, buffering=1 << 16):
+        self.file = io.open(path, "ab", buffering=buffering)
+        end = _complete_size(path)
+        if end < self.file.tell():
+            self.file.truncate(end)
+        self.batch_size = batch_size
+        self.snapshot_interval = snapshot_interval
+        self._batch = []
+        self._counts = {}
+
+    def track(self, obj, key, snapshot=True):
+        """Record events of the given object under a picklable ``key``"""
+        if snapshot:
+            self.snapshot(obj, key)
+        else:
+            self._counts[key] = 0
+        return obj.observe(observer=self._recorder(key), owner=self)
+
+    def untrack(self, obj):
+        obj.unobserve_all(self)
+
+    def snapshot(self, obj, key):
+        """Record all the values in an object's model
+
+        Defaults which haven't been computed yet are not recorded.
+        """
+        self._counts[key] = 0
+        values = {k: v for k, v in obj._model.items() if v is not Undefined}
+        self._append((SNAPSHOT, key, None, values))
+
+    def _recorder(self, key):
+        interval = self.snapshot_interval
+
+        def record(obj, event):
+            if isinstance(event, Trait.Set):
+                self._append((SET, key, event.name, event.new))
+            elif isinstance(event, Trait.Del):
+                self._append((DEL, key, event.name, None))
+            else:
+                return
+            if interval is not None:
+                count = self._counts[key] = self._counts.get(key, 0) + 1
+                if count >= interval:
+                    self.snapshot(obj, key)
+
+        return record
+
+    def _append(self, record):
+        batch = self._batch
+        batch.append(record)
+        if len(batch) >= self.batch_size:
+            self.write()
+
+    def write(self):
+        """Write held records to the file's buffer as a frame"""
+        if self._batch:
+            payload = pickle.dumps(self._batch, pickle.HIGHEST_PROTOCOL)
+            self.file.write(FRAME.pack(len(payload), len(self._batch)))
+            self.file.write(payload)
+            self._batch = []
+
+    def flush(self):
+        """Write held records and flush the file's buffer"""
+        self.write()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def records(path):
+    """Iterate over the records of a journal
+
+    A frame left incomplete by an interrupted write ends the iteration.
+    """
+    with io.open(path, "rb") as f:
+        while True:
+            header = f.read(FRAME.size)
+            if len(header) < FRAME.size:
+                return
+            length, count = FRAME.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            for record in pickle.loads(payload):
+                yield record
+
+
+def _complete_size(path):
+    """Get the size of a journal up to the end of its last complete frame"""
+    end = 0
+    with io.open(path, "rb") as f:
+        size = f.seek(0, io.SEEK_END)
+        while end + FRAME.size <= size:
+            f.seek(end)
+            length, count = FRAME.unpack(f.read(FRAME.size))
+            if end + FRAME.size + length > size:
+                break
+            end += FRAME.size + length
+    return end
+
+
+def replay(path):
+    """Fold the records of a journal into the latest trait values of each key"""
+    states = {}
+    for operation, key, name, value in records(path):
+        if operation == SET:
+            try:
+                states[key][name] = value
+            except KeyError:
+                states[key] = {name: value}
+        elif operation == DEL:
+            states.get(key, {}).pop(name, None)
+        else:
+            states[key] = dict(value)
+    return states
+
+
+def rebuild(path, factory):
+    """Create an object for each key in a journal and restore its trait values
+
+    The ``factory`` is called with each key, and the values of the object it
+    returns are restored with :func:`restore` rather than by replaying every
+    recorded event.
+    """
+    objects = {}
+    for key, values in replay(path).items():
+        obj = objects[key] = factory(key)
+        restore(obj, values)
+    return objects
+
+
+def restore(obj, values):
+    """Validate values and write them straight into an object's model
+
+    Unlike assignment, this neither emits events nor refuses to write traits
+    which aren't writable, since the values were recorded from such a model.
+    Every value is validated before any are written.
+    """
+    traits = obj.trait_index().traits
+    writes = []
+    for name, value in values.items():
+        trait = traits.get(name)
+        if trait is None:
+            writes.append((obj._model, name, value))
+        else:
+            trait, value = _validated(obj, trait, value)
+            writes.append((trait.model(obj), name, value))
+    for model, name, value in writes:
+        model[name] = value
+
+
+def _validated(obj, trait, value):
+    # like `resolve`, except that traits needn't be writable
+    if isinstance(trait, Union):
+        errors = ErrorGroup()
+        for member in trait.descriptors:
+            try:
+                return _validated(obj, member, value)
+            except Exception:
+                errors.add()
+        errors.throw()
+    else:
+        return trait, trait.validate(obj, value)
@@ -0,0 +1,222 @@
+import io
+import mmap
+import json
+import struct
+import pickle
+
+from .utils import fullname
+from .base.model import Undefined
+from .base.backends import StructBackend, StructArena, StructModel
+
+
+# ---------------------------------------------------------------
+# Memory Mapped Snapshots ---------------------------------------
+# ---------------------------------------------------------------
+
+# A snapshot file begins with a magic string and the length of a JSON
+# header describing the layout of its records. The records follow,
+# packed as they are by :class:`~stately.base.backends.StructBackend`,
+# so that fixed size numeric traits can be read straight from the map.
+# Any other values are pickled into an overflow table after the records,
+# which maps the index of a record to a dict of its remaining values.
+
+MAGIC = b"STATELY1"
+PREFIX = struct.Struct("=8sI")
+
+
+def snapshot(path, objects):
+    """Write the model values of objects of one class to a file
+
+    Values of traits laid out by :class:`StructBackend` are packed into
+    records, and every other value is pickled into an overflow table. A
+    value which can't be pickled raises an error rather than being lost.
+    """
+    objects = list(objects)
+    if not objects:
+        raise ValueError("Expected at least one object to snapshot")
+    cls = type(objects[0])
+    arena = StructBackend().layout(cls)
+    size = arena.record.size
+    records = bytearray(size * len(objects))
+    overflow = {}
+    for i, obj in enumerate(objects):
+        if type(obj) is not cls:
+            raise TypeError("Expected only %s objects, not %r" % (fullname(cls), obj))
+        offset = i * size
+        for name, value in obj._model.items():
+            if value is Undefined:
+                # the absence of a value
+                continue
+            field = arena.fields.get(name)
+            if field is not None and type(value) is field[3]:
+                index, position, fmt, datatype = field
+                try:
+                    struct.pack_into(fmt, records, offset + position, value)
+                except struct.error:
+                    pass
+                else:
+                    records[offset + arena.flags + index] = 1
+                    continue
+            overflow.setdefault(i, {})[name] = value
+    overflow = pickle.dumps(overflow, pickle.HIGHEST_PROTOCOL) if overflow else b""
+    header = json.dumps({
+        "class": fullname(cls),
+        "fields": _describe_fields(arena),
+        "count": len(objects),
+        "size": size,
+        "overflow": len(overflow),
+    }).encode("utf-8")
+    with io.open(path, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(records)
+        f.write(overflow)
+
+
+class Snapshot(object):
+    """Objects whose models are records in a memory mapped snapshot file
+
+    Objects are created when first indexed, and values are only unpacked
+    when their trait is read. If ``writable``, assigning a fixed size
+    numeric trait writes the new value to the file in place. If not, the
+    numeric values saved in the file can't be changed or deleted. Other
+    values are only changed in memory, and must be saved with
+    :func:`snapshot` to a new file.
+
+    The overflow table is loaded with :mod:`pickle`, which can run arbitrary
+    code, so only open files from sources you trust.
+    """
+
+    def __init__(self, path, cls, writable=True):
+        self.cls = cls
+        self.file = io.open(path, "r+b" if writable else "rb")
+        self.map = None
+        try:
+            self._open(path, writable)
+        except:
+            if self.map is not None:
+                self.map.close()
+            self.file.close()
+            raise
+
+    def _open(self, path, writable):
+        cls = self.cls
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+        magic, length = PREFIX.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError("%r is not a snapshot file" % path)
+        header = json.loads(self.map[PREFIX.size:PREFIX.size + length].decode("utf-8"))
+        if header["class"] != fullname(cls):
+            raise ValueError("%r is a snapshot of %s objects, not %s" % (
+                path, header["class"], fullname(cls)))
+        start = PREFIX.size + length
+        self.arena = MappedArena(StructBackend().layout(cls),
+            self.map, start, header["count"], writable)
+        if header["fields"] != _describe_fields(self.arena):
+            raise ValueError("The layout of %r does not match the traits "
+                "of %s" % (path, fullname(cls)))
+        self._overflow_start = start + header["count"] * header["size"]
+        self._overflow_size = header["overflow"]
+        self._overflow = None
+        self._objects = [None] * header["count"]
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        obj = self._objects[index]
+        if obj is None:
+            index %= len(self)
+            model = MappedModel(self.arena, self.arena.record_at(index))
+            overflow = self.overflow().get(index)
+            if overflow is not None:
+                model.overflow = dict(overflow)
+            obj = self._objects[index] = self.cls(model=model)
+        return obj
+
+    def overflow(self):
+        """Get the values which weren't packed into records, loading them on first use"""
+        if self._overflow is None:
+            if self._overflow_size:
+                start = self._overflow_start
+                self._overflow = pickle.loads(self.map[start:start + self._overflow_size])
+            else:
+                self._overflow = {}
+        return self._overflow
+
+    def flush(self):
+        """Write changes made in place back to the file"""
+        self.map.flush()
+
+    def close(self):
+        if self.arena.writable:
+            self.map.flush()
+        self._objects = []
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MappedArena(StructArena):
+    """A :class:`StructArena` whose first records are in a memory mapped file
+
+    New records are allocated from anonymous pages as usual.
+    """
+
+    def __init__(self, layout, page, start, count, writable=True):
+        super(MappedArena, self).__init__(layout.fields, layout.record)
+        self.mapped = page
+        self.start = start
+        self.count = count
+        self.writable = writable
+
+    def record_at(self, index):
+        return self.mapped, self.start + index * self.record.size
+
+    def release(self, record):
+        if record[0] is not self.mapped:
+            super(MappedArena, self).release(record)
+
+
+class MappedModel(StructModel):
+    """A :class:`StructModel` which refuses to change a read-only snapshot"""
+
+    __slots__ = ()
+
+    def __setitem__(self, name, value):
+        if self._is_read_only(name):
+            if self.overflow is None:
+                self.overflow = {}
+            # fields without a saved value are kept in memory
+            self.overflow[name] = value
+        else:
+            super(MappedModel, self).__setitem__(name, value)
+
+    def __delitem__(self, name):
+        self._is_read_only(name)
+        super(MappedModel, self).__delitem__(name)
+
+    def _is_read_only(self, name):
+        arena = self.arena
+        if arena.writable or self.page is not arena.mapped:
+            return False
+        field = arena.fields.get(name)
+        if field is not None and self.page[self.offset + arena.flags + field[0]]:
+            raise TypeError("The saved value of %r can't be changed because "
+                "the snapshot was opened read-only" % name)
+        return True
+
+
+def _describe_fields(arena):
+    fields = sorted(arena.fields.items(), key=lambda i: i[1][0])
+    return [[name, fmt] for name, (index, position, fmt, datatype) in fields]
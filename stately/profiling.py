@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import types
+import threading
+from collections import defaultdict
+
+from .utils import fullname
+from .stately import Stately, Observer, WeakObserver, OffloadedObserver
+
+
+# ---------------------------------------------------------------
+# Event Profiling -----------------------------------------------
+# ---------------------------------------------------------------
+
+
+_enabled_lock = threading.Lock()
+
+
+class Profile(object):
+    """Record statistics about the events actualized by :class:`Stately` objects
+
+    While enabled, :class:`Stately` objects report each event they actualize
+    to this profile, run its engine's stages through :meth:`stage`, and send
+    notifications through :meth:`notify`. When no profile is enabled, they
+    only check that none is. Events are counted by class, trait, and type,
+    time is measured for each status of their engines, and each observer's
+    calls are timed.
+
+    Assignments to traits without observers usually skip events entirely.
+    Give ``all_events=True`` to force them through the engine so they're
+    counted, at the price of slowing them down while profiling.
+
+    Events actualized by :class:`AsyncStately` coroutines aren't profiled.
+    """
+
+    def __init__(self, all_events=False):
+        self.all_events = all_events
+        self.reset()
+
+    def reset(self):
+        self.events = defaultdict(int)
+        self.statuses = defaultdict(float)
+        self.observers = defaultdict(lambda: [0, 0.0])
+
+    @property
+    def enabled(self):
+        return Stately._profile is self
+
+    def enable(self):
+        with _enabled_lock:
+            if Stately._profile is not None:
+                raise RuntimeError("Another profile is already enabled")
+            Stately._profile = self
+        return self
+
+    def disable(self):
+        with _enabled_lock:
+            if Stately._profile is self:
+                Stately._profile = None
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def count(self, obj, event):
+        self.events[(fullname(type(obj)), event.trait.name, event.typename)] += 1
+
+    def stage(self, method, event, obj, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(event, obj, *args, **kwargs)
+        finally:
+            key = (fullname(type(obj)), event.trait.name, str(event.status))
+            self.statuses[key] += time.perf_counter() - start
+
+    def notify(self, observer, obj, event):
+        start = time.perf_counter()
+        try:
+            observer(obj, event)
+        finally:
+            record = self.observers[observer_name(observer)]
+            record[0] += 1
+            record[1] += time.perf_counter() - start
+
+    def snapshot(self):
+        """Get a copy of the statistics recorded so far as plain data"""
+        events, statuses = [], []
+        for (cls, trait, typename), count in sorted(list(self.events.items())):
+            events.append({"class": cls, "trait": trait, "event": typename, "count": count})
+        for (cls, trait, status), seconds in sorted(list(self.statuses.items())):
+            statuses.append({"class": cls, "trait": trait, "status": status, "seconds": seconds})
+        observers = [{"observer": name, "calls": calls, "seconds": seconds}
+            for name, (calls, seconds) in sorted(list(self.observers.items()))]
+        return {"events": events, "statuses": statuses, "observers": observers}
+
+    def prometheus(self):
+        """Render a snapshot in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help, samples, value, *labels):
+            lines.append("# HELP %s %s" % (name, help))
+            lines.append("# TYPE %s %s" % (name, kind))
+            for s in samples:
+                text = ",".join('%s="%s"' % (l, _escape(s[k])) for l, k in labels)
+                lines.append("%s{%s} %r" % (name, text, s[value]))
+
+        metric("stately_events_total", "counter", "Events actualized.",
+            snapshot["events"], "count", ("class", "class"), ("trait", "trait"), ("event", "event"))
+        metric("stately_status_seconds_total", "counter", "Time spent in each status of an event.",
+            snapshot["statuses"], "seconds", ("class", "class"), ("trait", "trait"), ("status", "status"))
+        metric("stately_observer_calls_total", "counter", "Notifications sent to an observer.",
+            snapshot["observers"], "calls", ("observer", "observer"))
+        metric("stately_observer_seconds_total", "counter", "Time spent in an observer.",
+            snapshot["observers"], "seconds", ("observer", "observer"))
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, format="json"):
+        """Write a snapshot to a file as ``"json"`` or ``"prometheus"`` text
+
+        The file is replaced atomically, so it may be read by collectors at any time.
+        """
+        if format == "json":
+            text = json.dumps(self.snapshot(), indent=2)
+        elif format == "prometheus":
+            text = self.prometheus()
+        else:
+            raise ValueError("Expected 'json' or 'prometheus', not %r" % format)
+        temporary = "%s.%s.tmp" % (path, os.getpid())
+        with open(temporary, "w") as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+
+def observer_name(observer):
+    """Get the qualified name of the function an observer ultimately calls"""
+    while True:
+        if isinstance(observer, OffloadedObserver):
+            observer = observer.observer
+        elif isinstance(observer, WeakObserver):
+            observer = observer.ref()
+        elif isinstance(observer, Observer):
+            observer = observer.callback
+        elif isinstance(observer, types.MethodType):
+            observer = observer.__func__
+        else:
+            break
+    name = getattr(observer, "__qualname__", None)
+    if name is None:
+        return fullname(type(observer))
+    return "%s.%s" % (getattr(observer, "__module__", None), name)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
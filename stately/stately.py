@@ -1,4 +1,12 @@
+import time
 import types
+import asyncio
+import inspect
+import weakref
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
 
 from .base.model import Descriptor
 from .utils import Sentinel, describe, decoration
@@ -58,18 +66,45 @@ All = Sentinel("All", "all values")
 
 class Stately(HasTraits):
 
+    # an enabled `stately.profiling.Profile`, which
+    # records the events of every Stately object
+    _profile = None
+
     def __init__(self, *args, **kwargs):
         self._observers = ObserverMapping()
+        self._deliveries = None
         super(Stately, self).__init__(*args, **kwargs)
 
-    def observe(self, names=All, typenames=All, statuses=None, observer=None):
+    def observe(self, names=All, typenames=All, statuses=None,
+            observer=None, weak=False, owner=None, executor=None):
+
+        if executor is not None:
+            if executor == "thread":
+                executor = thread_pool()
+            elif not isinstance(executor, Executor):
+                raise TypeError("Expected 'thread' or an Executor, not %r" % executor)
+            if any(s is not None for s in parse_statuses(statuses)):
+                # earlier statuses can veto a change, which requires observers
+                # to run on the thread that made it, before the change is done
+                raise ValueError("Only observers of completed events, where "
+                    "statuses=None, can be given an executor")
 
         def setup(observer):
-            for n in parse_trait_names(self, names):
-                for t in parse_typenames(typenames):
-                    for s in parse_statuses(statuses):
-                        self._observers.add(n, t, s, observer)
-            return observer
+            entry = observer
+            if executor is not None:
+                offload = lambda o: OffloadedObserver(o, executor)
+            else:
+                offload = None
+            if weak:
+                # weak observers are removed once garbage collected
+                entry = self._observers.weaken(observer, offload)
+            elif offload is not None:
+                entry = offload(observer)
+            components = [(n, t, s)
+                for n in parse_trait_names(self, names)
+                for t in parse_typenames(typenames)
+                for s in parse_statuses(statuses)]
+            return self._observers.subscribe(entry, components, owner)
 
         if observer is not None:
             return setup(observer)
@@ -89,20 +124,332 @@ class Stately(HasTraits):
     def observers(self, name=All, etype=All, status=None):
         return [o for c, o in self._observers.get_by_components(name, etype, status)]
 
+    def flush(self, timeout=None):
+        """Wait for notifications sent to observers with an executor to be delivered
+
+        Raises an :class:`ObserverErrors` if any of those observers failed.
+        Returns False if the timeout expired first, otherwise True.
+        """
+        if self._deliveries is None:
+            return True
+        done, errors = True, []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for deliveries in list(self._deliveries.values()):
+            if deadline is not None:
+                timeout = max(0, deadline - time.monotonic())
+            try:
+                done = deliveries.join(timeout) and done
+            except ObserverErrors as error:
+                errors.extend(error.errors)
+        if errors:
+            raise ObserverErrors(errors)
+        return done
+
+    join = flush
+
+    def _offload(self, executor):
+        # notifications are queued for each executor
+        if self._deliveries is None:
+            self._deliveries = {}
+        deliveries = self._deliveries.get(executor)
+        if deliveries is None:
+            deliveries = self._deliveries.setdefault(executor, Deliveries(executor))
+        return deliveries
+
+    def unobserve(self, handle):
+        """Remove observations using the handle returned by :meth:`observe`"""
+        handle.remove()
+
+    def unobserve_all(self, owner):
+        """Remove every observation registered with the given ``owner``"""
+        self._observers.remove_owner(owner)
+
+    def observer_stats(self):
+        """Count this object's strong, weak, and dead observers"""
+        return self._observers.stats()
+
     def actualize_event(self, event):
-        result = None
-        for _result in event(self):
+        statuses = self._observers.statuses(event.trait.name, event.typename_lineage)
+        profile = self._profile
+        if profile is None:
+            result = event.execute(statuses, self._event_advanced, self)
+        else:
+            profile.count(self, event)
+            result = event.execute(statuses, self._event_advanced, self, stage=profile.stage)
+        if None in statuses:
             self._event_advanced(event)
-            if _result is not None:
-                result = _result
-        self._event_advanced(event)
         return result
 
+    def needs_event(self, trait, etype):
+        return (self._observers.observes(trait.name, etype.typename_lineage) or
+            (self._profile is not None and self._profile.all_events))
+
     def _event_advanced(self, event):
+        profile = self._profile
         for observer in self._observers.get(event):
             # we avoid using the `locked` context
             # manager due to unnecessary overhead
-            observer(self, event)
+            if profile is None:
+                observer(self, event)
+            else:
+                profile.notify(observer, self, event)
+
+
+class ThreadSafeStately(Stately):
+    """A :class:`Stately` whose events may be actualized from many threads
+
+    Events on an object are actualized one at a time while holding its
+    reentrant lock, which is available through :meth:`locked`. Trait values
+    are read without locking, and traits without observers are written with
+    a single dict store. Observers may be added or removed while others are
+    being notified since each notification works on a snapshot of them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.RLock()
+        self._holding = None
+        super(ThreadSafeStately, self).__init__(*args, **kwargs)
+        # no other thread has seen this object yet
+        self._observers.lock = threading.RLock()
+
+    def locked(self):
+        """Get the lock held while this object's events are actualized"""
+        return self._lock
+
+    def update(self, **values):
+        with self._lock:
+            return super(ThreadSafeStately, self).update(**values)
+
+    @contextmanager
+    def delayed_events(self, *include, coalesce=False):
+        # hold the lock until held events have been replayed
+        with self._lock:
+            with super(ThreadSafeStately, self).delayed_events(
+                    *include, coalesce=coalesce) as hold:
+                yield hold
+
+    @contextmanager
+    def intercepted_events(self, *include):
+        # rather than replacing methods on the instance, which
+        # would affect every thread, events are held while the
+        # lock is held - other threads must wait for the release
+        with self._lock:
+            queue = []
+            previous, self._holding = self._holding, (queue, include)
+            try:
+                yield queue
+            finally:
+                self._holding = previous
+
+    def actualize_event(self, event):
+        with self._lock:
+            holding = self._holding
+            if holding is not None:
+                queue, include = holding
+                if not include or isinstance(event, include):
+                    queue.append(event)
+                    return
+            return super(ThreadSafeStately, self).actualize_event(event)
+
+    def needs_event(self, trait, etype):
+        return (self._holding is not None or
+            super(ThreadSafeStately, self).needs_event(trait, etype))
+
+
+class OffloadedObserver(object):
+    """Sends notifications to an observer through an executor, in order"""
+
+    def __init__(self, observer, executor):
+        self.observer = observer
+        self.executor = executor
+
+    def __call__(self, owner, event):
+        owner._offload(self.executor).put(self.observer, owner, event)
+
+
+class Deliveries(object):
+    """A queue of offloaded notifications which are delivered one at a time"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.queue = deque()
+        self.errors = []
+        self.running = False
+        self.condition = threading.Condition()
+
+    def put(self, observer, *args):
+        with self.condition:
+            self.queue.append((observer, args))
+            if self.running:
+                return
+            self.running = True
+        self.executor.submit(self._drain)
+
+    def join(self, timeout=None):
+        with self.condition:
+            done = self.condition.wait_for(lambda: not self.running, timeout)
+            errors, self.errors = self.errors, []
+        if errors:
+            raise ObserverErrors(errors)
+        return done
+
+    def _drain(self):
+        while True:
+            with self.condition:
+                if not self.queue:
+                    self.running = False
+                    self.condition.notify_all()
+                    return
+                observer, args = self.queue.popleft()
+            try:
+                observer(*args)
+            except Exception as error:
+                with self.condition:
+                    self.errors.append(error)
+
+
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+
+
+def thread_pool():
+    """Get the thread pool used by observers given ``executor="thread"``"""
+    global _thread_pool
+    if _thread_pool is None:
+        with _thread_pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor()
+    return _thread_pool
+
+
+class ObserverErrors(Exception):
+    """Raised when several observers fail together, or offloaded observers fail"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super(ObserverErrors, self).__init__("%s observers raised exceptions: %s"
+            % (len(self.errors), ", ".join(repr(e) for e in self.errors)))
+
+
+class AsyncStately(Stately):
+    """A :class:`Stately` whose events may be actualized within an event loop
+
+    Events actualized by :meth:`actualize_event_async` await any stage which
+    returns an awaitable, and await the coroutines returned by the observers
+    of each stage together with :func:`asyncio.gather`. When several of them
+    fail, an :class:`ObserverErrors` is raised which holds every exception.
+
+    Events actualized synchronously (e.g. by assigning a trait) schedule the
+    coroutines of async observers as tasks on the running event loop instead.
+    Those tasks are awaited by :meth:`drain`, which raises the errors of any
+    that failed.
+    """
+
+    # await the observers of a stage one by one, in
+    # the order they were registered, not concurrently
+    ordered_observers = False
+
+    # the maximum number of observer coroutines
+    # awaited at once, or None if there's no limit
+    observer_concurrency = None
+
+    def __init__(self, *args, **kwargs):
+        self._tasks = set()
+        self._task_errors = []
+        super(AsyncStately, self).__init__(*args, **kwargs)
+
+    async def drain(self):
+        """Await observer tasks scheduled by synchronous events
+
+        Raises an :class:`ObserverErrors` if any of those tasks failed.
+        """
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+        if self._task_errors:
+            errors, self._task_errors = self._task_errors, []
+            raise ObserverErrors(errors)
+
+    async def set_async(self, name, value):
+        """Assign a trait, awaiting the resulting event"""
+        trait = self.trait_index().traits.get(name)
+        if trait is None:
+            raise TraitError("%s has no trait named %r" % (describe("the", self), name))
+        trait, value = trait.resolve(self, value)
+        event = trait.event("Set", new=value, validated=True)
+        return await self.actualize_event_async(event)
+
+    async def actualize_event_async(self, event):
+        statuses = self._observers.statuses(event.trait.name, event.typename_lineage)
+        result = await event.execute_async(statuses, self._event_advanced_async, self)
+        if None in statuses:
+            await self._event_advanced_async(event)
+        return result
+
+    async def _event_advanced_async(self, event):
+        if self.ordered_observers:
+            for observer in self._observers.get(event):
+                outcome = observer(self, event)
+                if inspect.isawaitable(outcome):
+                    await outcome
+        else:
+            pending = []
+            for observer in self._observers.get(event):
+                outcome = observer(self, event)
+                if inspect.isawaitable(outcome):
+                    pending.append(outcome)
+            if pending:
+                if self.observer_concurrency is not None:
+                    pending = _limited(pending, self.observer_concurrency)
+                outcomes = await asyncio.gather(*pending, return_exceptions=True)
+                errors = [o for o in outcomes if isinstance(o, BaseException)]
+                if len(errors) == 1:
+                    raise errors[0]
+                elif errors:
+                    raise ObserverErrors(errors)
+
+    def _event_advanced(self, event):
+        for observer in self._observers.get(event):
+            outcome = observer(self, event)
+            if inspect.isawaitable(outcome):
+                self._schedule(outcome)
+
+    def _schedule(self, awaitable):
+        try:
+            loop = _get_running_loop()
+        except RuntimeError:
+            if inspect.iscoroutine(awaitable):
+                # don't warn that it was never awaited
+                awaitable.close()
+            raise RuntimeError("An async observer of %s was notified outside "
+                "of a running event loop - use 'set_async' or assign traits "
+                "within a coroutine" % describe("the", self))
+        task = asyncio.ensure_future(awaitable, loop=loop)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self._task_errors.append(task.exception())
+
+
+try:
+    _get_running_loop = asyncio.get_running_loop
+except AttributeError:
+    # Python < 3.7
+    def _get_running_loop():
+        loop = asyncio.get_event_loop()
+        if not loop.is_running():
+            raise RuntimeError("no running event loop")
+        return loop
+
+
+def _limited(awaitables, limit):
+    semaphore = asyncio.Semaphore(limit)
+    async def limit_to(awaitable):
+        async with semaphore:
+            return await awaitable
+    return [limit_to(a) for a in awaitables]
 
 
 # ---------------------------------------------------------------
@@ -172,9 +519,13 @@ class Observer(Descriptor):
     def __eq__(self, other):
         if isinstance(other, Observer):
             return other.condition == self.condition and self.callback == other.callback
-        else:
+        elif isinstance(other, tuple) and len(other) == 2:
             condition, callback = other
             return condition == self.condition and callback == self.callback
+        else:
+            return NotImplemented
+
+    __hash__ = object.__hash__
 
     def __init_instance__(self, obj):
         obj.observe(*self.args, **self.kwargs)(self)
@@ -183,63 +534,251 @@ class Observer(Descriptor):
 observe = decoration(Observer)
 
 
+class WeakObserver(object):
+    """Calls an observer through a weak reference, if it's still alive"""
+
+    def __init__(self, observer, callback=None):
+        if isinstance(observer, types.MethodType):
+            self.ref = weakref.WeakMethod(observer, callback)
+        else:
+            self.ref = weakref.ref(observer, callback)
+
+    @property
+    def alive(self):
+        return self.ref() is not None
+
+    def __call__(self, *args, **kwargs):
+        observer = self.ref()
+        if observer is not None:
+            return observer(*args, **kwargs)
+
+    def __eq__(self, other):
+        if isinstance(other, WeakObserver):
+            other = other.ref()
+        observer = self.ref()
+        return observer is not None and observer == other
+
+    __hash__ = object.__hash__
+
+
 # ---------------------------------------------------------------
 # Observer Storage ----------------------------------------------
 # ---------------------------------------------------------------
 
 
+class ObserverHandle(object):
+    """A subscription made by :meth:`Stately.observe` which can be removed in O(1)
+
+    Calling the handle calls its observer, so that observers decorated with
+    :meth:`Stately.observe` can still be called directly.
+    """
+
+    def __init__(self, mapping, observer, owner=None):
+        self.mapping = mapping
+        self.observer = observer
+        self.owner = owner
+        self.components = []
+
+    @property
+    def active(self):
+        return len(self.components) > 0
+
+    def remove(self):
+        self.mapping.remove(self)
+
+    def __call__(self, *args, **kwargs):
+        return self.observer(*args, **kwargs)
+
+
+class _NoLock(object):
+    """A stand-in for the lock of an object only used by one thread at a time"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_no_lock = _NoLock()
+
+
 class ObserverMapping(object):
 
-    def __init__(self):
+    def __init__(self, lock=_no_lock):
+        # typename -> name -> status -> {handle: observer}
         self.mapping = {}
+        # id(observer) -> {handle: None}
         self.inversion = {}
+        # owner -> {handle: None}
+        self.owners = {}
+        # compiled lookups for each trait name which
+        # are cleared when its observers change
+        self.dispatch = {}
+        self.presence = {}
+        # guards changes to the mapping and compilation of
+        # lookups - cached lookups are read freely - which
+        # needs a reentrant lock if shared between threads
+        self.lock = lock
+
+    def subscribe(self, observer, components, owner=None):
+        """Add an observer for each (name, typename, status) and return its handle"""
+        with self.lock:
+            handle = ObserverHandle(self, observer, owner)
+            mapping = self.mapping
+            for name, typename, status in components:
+                observers = (mapping.setdefault(typename, {})
+                    .setdefault(name, {}).setdefault(status, OrderedDict()))
+                if handle not in observers:
+                    observers[handle] = observer
+                    handle.components.append((name, typename, status))
+                    self._recompile(name)
+            self.inversion.setdefault(id(observer), OrderedDict())[handle] = None
+            if owner is not None:
+                self.owners.setdefault(owner, OrderedDict())[handle] = None
+            return handle
 
     def add(self, name, typename, status, observer):
-        mapping = self.mapping
-        mapping.setdefault(typename, {})
-        mapping[typename].setdefault(name, {})
-        mapping[typename][name].setdefault(status, [])
-        if observer not in mapping[typename][name][status]:
-            mapping[typename][name][status].append(observer)
-        self.inversion.setdefault(id(observer), [])
-        self.inversion[id(observer)].append((name, typename, status))
+        return self.subscribe(observer, [(name, typename, status)])
+
+    def remove(self, handle):
+        """Remove all observations made through the given handle"""
+        with self.lock:
+            for component in handle.components:
+                self._detach(handle, *component)
+            del handle.components[:]
+            self._forget(handle)
+
+    def remove_owner(self, owner):
+        """Remove every observation made on behalf of the given owner"""
+        with self.lock:
+            for handle in list(self.owners.get(owner, ())):
+                self.remove(handle)
+
+    def weaken(self, observer, wrap=None):
+        """Wrap an observer in a :class:`WeakObserver` that is deleted when it dies
+
+        If given, ``wrap`` is called with the :class:`WeakObserver` to make
+        the entry which is actually stored, and deleted, in its place.
+        """
+        this = weakref.ref(self)
+        def finalize(ref):
+            mapping = this()
+            if mapping is not None:
+                mapping.delete(entry)
+        entry = WeakObserver(observer, finalize)
+        if wrap is not None:
+            entry = wrap(entry)
+        return entry
+
+    def stats(self):
+        """Count the distinct observers in the mapping by kind"""
+        with self.lock:
+            counts = {"strong": 0, "weak": 0, "dead": 0}
+            for handles in self.inversion.values():
+                o = next(iter(handles)).observer
+                while isinstance(o, OffloadedObserver):
+                    o = o.observer
+                if not isinstance(o, WeakObserver):
+                    counts["strong"] += 1
+                elif o.alive:
+                    counts["weak"] += 1
+                else:
+                    counts["dead"] += 1
+            counts["alive"] = counts["strong"] + counts["weak"]
+            counts["handles"] = sum(len(h) for h in self.inversion.values())
+            return counts
+
+    def observes(self, name, typenames):
+        """Whether there are observers of the given trait name and any typename"""
+        return bool(self.statuses(name, typenames))
+
+    def statuses(self, name, typenames):
+        """Get the set of statuses observed for a trait name and any typename"""
+        try:
+            return self.presence[name][typenames]
+        except KeyError:
+            pass
+        with self.lock:
+            result = set()
+            mapping = self.mapping
+            for typename in typenames:
+                for status, observers in mapping.get(typename, {}).get(name, {}).items():
+                    if observers:
+                        result.add(status)
+            result = frozenset(result)
+            self.presence.setdefault(name, {})[typenames] = result
+            return result
 
     def get(self, event):
-        return self.get_by_components(*self._to_components(event))
+        return self.get_by_components(event.trait.name, event.typename_lineage, event.status)
 
     def get_by_components(self, name, typenames, status):
-        result = []
-        mapping = self.mapping
-        for typename in typenames:
-            result.extend(mapping.get(typename, {}).get(name, {}).get(status, []))
-        return result
+        """Get a tuple of observers for a trait name, list of typenames, and status"""
+        if not isinstance(typenames, tuple):
+            typenames = tuple(typenames)
+        try:
+            return self.dispatch[name][(typenames, status)]
+        except KeyError:
+            pass
+        with self.lock:
+            result = []
+            mapping = self.mapping
+            for typename in typenames:
+                result.extend(mapping.get(typename, {}).get(name, {}).get(status, {}).values())
+            result = tuple(result)
+            self.dispatch.setdefault(name, {})[(typenames, status)] = result
+            return result
 
     def delete(self, observer):
-        for n, t, s in self.inversion(id(observer)):
-            self.delete_by_components(n, t, s, observer)
+        """Remove every observation made with the given observer"""
+        with self.lock:
+            for handle in list(self.inversion.get(id(observer), ())):
+                self.remove(handle)
 
     def delete_by_components(self, name, typename, status, observer=None):
-        tmap = self.mapping
-        try:
-            nmap = tmap[typename]
-            smap = nmap[name]
-            l = smap[status]
-        except KeyError:
-            pass
-        else:
-            try:
-                if observer is None:
-                    del l[:]
-                else:
-                    l.remove(observer)
-            except ValueError:
-                pass
-            else:
-                # clean up after the deletion
-                if len(l) == 0:
-                    del nmap[status]
-                    if len(nmap) == 0:
-                        del tmap[name]
+        """Remove the given observer, or all observers, of a single component"""
+        with self.lock:
+            observers = self.mapping.get(typename, {}).get(name, {}).get(status, {})
+            component = (name, typename, status)
+            for handle, o in list(observers.items()):
+                if observer is None or o is observer:
+                    self._detach(handle, *component)
+                    handle.components.remove(component)
+                    if not handle.components:
+                        self._forget(handle)
+
+    def _detach(self, handle, name, typename, status):
+        mapping = self.mapping
+        nmap = mapping[typename]
+        smap = nmap[name]
+        observers = smap[status]
+        del observers[handle]
+        # clean up after the deletion
+        if not observers:
+            del smap[status]
+            if not smap:
+                del nmap[name]
+                if not nmap:
+                    del mapping[typename]
+        self._recompile(name)
+
+    def _forget(self, handle):
+        indices = [(self.inversion, id(handle.observer))]
+        if handle.owner is not None:
+            indices.append((self.owners, handle.owner))
+        for index, key in indices:
+            handles = index.get(key)
+            if handles is not None:
+                handles.pop(handle, None)
+                if not handles:
+                    del index[key]
+
+    def _recompile(self, name):
+        self.dispatch.pop(name, None)
+        self.presence.pop(name, None)
 
     def _to_components(self, event):
         return event.trait.name, event.typename_lineage, event.status
@@ -0,0 +1,270 @@
+import weakref
+from array import array
+from collections.abc import MutableMapping
+
+from .utils import describe
+from .base.events import EventModel
+from .base.model import Undefined, TraitError
+from .traits import Instance
+
+
+# ---------------------------------------------------------------
+# Column Storage ------------------------------------------------
+# ---------------------------------------------------------------
+
+
+# typecodes for traits whose values can be packed into an array
+typecodes = {int: "q", float: "d"}
+
+
+class Column(object):
+    """The values of one trait for every row of a :class:`StatelyTable`
+
+    Values of exactly ``int`` or ``float`` traits are packed into an
+    :class:`array.array` which supports the buffer protocol, so that
+    :meth:`numpy` can view them without copying. Other values, or
+    values which don't fit into the array, are kept in a list.
+    """
+
+    def __init__(self, trait, size=0):
+        self.trait = trait
+        datatype = getattr(trait, "datatype", None)
+        if isinstance(trait, Instance) and datatype in typecodes:
+            self.datatype = datatype
+            self.values = array(typecodes[datatype], [0]) * size
+        else:
+            self.datatype = None
+            self.values = [None] * size
+        self.present = bytearray(size)
+
+    @property
+    def packed(self):
+        return self.datatype is not None
+
+    def extend(self, size):
+        if self.packed:
+            self.values.extend(array(self.values.typecode, [0]) * size)
+        else:
+            self.values.extend([None] * size)
+        self.present.extend(bytes(size))
+
+    def get(self, index, default=Undefined):
+        if self.present[index]:
+            return self.values[index]
+        else:
+            return default
+
+    def set(self, index, value):
+        if self.packed and type(value) is not self.datatype:
+            self.unpack()
+        try:
+            self.values[index] = value
+        except OverflowError:
+            self.unpack()
+            self.values[index] = value
+        self.present[index] = 1
+
+    def delete(self, index):
+        if not self.present[index]:
+            raise KeyError(self.trait.name)
+        self.present[index] = 0
+        if not self.packed:
+            self.values[index] = None
+
+    def unpack(self):
+        """Switch from array storage to a list that accepts any value"""
+        if self.packed:
+            self.values = list(self.values)
+            self.datatype = None
+
+    def numpy(self):
+        """Get the column as a numpy array - a view if the column is packed
+
+        A view shares the column's memory, so while one is alive rows
+        can't be appended to the table - a :class:`BufferError` is raised.
+        """
+        import numpy
+        if self.packed:
+            return numpy.frombuffer(self.values, dtype=self.values.typecode)
+        else:
+            return numpy.array(self.values, dtype=object)
+
+
+class RowModel(MutableMapping):
+    """The model of a row view which reads and writes its table's columns"""
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns, index):
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, name):
+        value = self.columns[name].get(self.index)
+        if value is Undefined:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self.columns[name].set(self.index, value)
+
+    def __delitem__(self, name):
+        self.columns[name].delete(self.index)
+
+    def __iter__(self):
+        for name, column in self.columns.items():
+            if column.present[self.index]:
+                yield name
+
+    def __len__(self):
+        return sum(1 for name in self)
+
+
+# ---------------------------------------------------------------
+# Table Of Stately Objects --------------------------------------
+# ---------------------------------------------------------------
+
+
+class ColumnSet(EventModel):
+    """An event describing the assignment of many rows of one column"""
+
+    subtypename = "column set"
+
+    def __init__(self, name, rows, old, new):
+        super(ColumnSet, self).__init__(name=name, rows=rows, old=old, new=new)
+
+
+class StatelyTable(object):
+    """Stores the traits of many objects of one class as columns
+
+    Indexing the table returns a view of a row which is an instance of
+    the class whose model reads and writes the columns. Row views have
+    traits, validation and observers like any other instance. The same
+    view is returned for a row so long as a reference to it is kept. The
+    class must accept a ``model`` keyword, as :class:`~stately.Stately` does.
+
+    Views are held weakly, but the observers of a row are kept by the
+    table once its view is collected, and given to the row's next view.
+
+    Parameters
+    ----------
+    cls: type
+        The :class:`~stately.Stately` subclass the rows are instances of.
+    rows: iterable of dicts
+        Trait values for the initial rows of the table.
+    """
+
+    def __init__(self, cls, rows=()):
+        self.cls = cls
+        self.size = 0
+        self.columns = {n: Column(t) for n, t in cls.traits().items()}
+        self._views = weakref.WeakValueDictionary()
+        # the observer mappings of rows whose views were collected
+        self._row_observers = {}
+        self._observers = []
+        for values in rows:
+            self.append(**values)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("%s has no row %r" % (describe("the", self), index))
+        view = self._views.get(index)
+        if view is None:
+            view = self.cls(model=RowModel(self.columns, index))
+            observers = getattr(view, "_observers", None)
+            if observers is not None:
+                observers = self._row_observers.pop(index, observers)
+                view._observers = observers
+                weakref.finalize(view, _keep_observers,
+                    weakref.ref(self), index, observers)
+            self._views[index] = view
+        return view
+
+    def append(self, **values):
+        """Add a row with the given trait values and return its view"""
+        extended = []
+        try:
+            for column in self.columns.values():
+                column.extend(1)
+                extended.append(column)
+            self.size += 1
+            view = self[self.size - 1]
+            view.update(**values)
+        except Exception:
+            if len(extended) == len(self.columns):
+                self.size -= 1
+                self._views.pop(self.size, None)
+            for column in extended:
+                del column.values[-1]
+                del column.present[-1]
+            raise
+        return view
+
+    def column(self, name):
+        """Get the :class:`Column` of the trait with the given name"""
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise TraitError("%s has no trait named %r" % (describe("the", self.cls), name))
+
+    def assign(self, name, values, rows=None):
+        """Assign many rows of one column, notifying table observers once
+
+        Every value is validated before any are written. If ``values`` is a
+        numpy array whose dtype matches a packed column, it is copied into
+        the column without validating each element. Observers of the row
+        views are not notified - only those of the table, with a single
+        :class:`ColumnSet` event.
+        """
+        column = self.column(name)
+        rows = range(self.size) if rows is None else list(rows)
+        if len(values) != len(rows):
+            raise ValueError("Expected %s values, not %s" % (len(rows), len(values)))
+        if not rows:
+            return
+        old = [column.get(i) for i in rows]
+        if column.packed and _is_matching_array(values, column):
+            new = values.tolist()
+            for i, v in zip(rows, new):
+                column.set(i, v)
+        else:
+            # the first row view is given to traits for error messages
+            view, trait = self[rows[0]], column.trait
+            new = [trait.resolve(view, v)[1] for v in values]
+            for i, v in zip(rows, new):
+                column.set(i, v)
+        event = ColumnSet(name, rows, old, new)
+        for observer in tuple(self._observers):
+            observer(self, event)
+
+    def observe(self, observer):
+        """Call ``observer(table, event)`` with a :class:`ColumnSet` on every :meth:`assign`"""
+        self._observers.append(observer)
+        return observer
+
+    def unobserve(self, observer):
+        self._observers.remove(observer)
+
+
+def _keep_observers(table, index, observers):
+    # called once the view of a row is collected
+    table = table()
+    if table is not None and observers.inversion and index < table.size:
+        table._row_observers[index] = observers
+
+
+def _is_matching_array(values, column):
+    kind = getattr(getattr(values, "dtype", None), "kind", None)
+    if column.datatype is int:
+        return kind is not None and kind in "iu"
+    else:
+        return kind == "f" and column.datatype is float
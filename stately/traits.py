@@ -1,12 +1,14 @@
+import abc
 import functools
-from warnings import WarningMessage
+from warnings import warn
 from contextlib import contextmanager
 
-from .utils import describe, describe_them, conjunction
+from .utils import describe, describe_them, conjunction, ErrorGroup
 
 from .base.proxies import ProxyManyDescriptors
 from .base.events import EventModel, before, after, between
-from .base.model import ObjectModel, TraitModel, TraitError, Undefined
+from .base.model import (ObjectModel, TraitModel, TraitError, Undefined,
+    unwritable_message, rejected_message)
 
 
 # ---------------------------------------------------------------
@@ -14,30 +16,93 @@ from .base.model import ObjectModel, TraitModel, TraitError, Undefined
 # ---------------------------------------------------------------
 
 
-class RollbackWarning(WarningMessage):
+class RollbackWarning(RuntimeWarning):
     """A warning which is raised when a trait event fails to revert changes"""
     pass
 
 
 class Event(EventModel):
 
+    __slots__ = ()
+
     def __init__(self, trait, **attrs):
-        super(Event, self).__init__(trait=trait, name=trait.name, **attrs)
+        super(Event, self).__init__(**attrs)
         self.trait = trait
 
+    @property
+    def name(self):
+        return self.trait.name
+
+    def attributes(self):
+        info = super(Event, self).attributes()
+        if "trait" in info:
+            info["name"] = self.name
+        return info
+
     def model(self, obj):
         return self.trait.model(obj)
 
 
 class HasTraits(ObjectModel):
 
+    def update(self, **values):
+        """Assign many trait values at once
+
+        Every value is validated once, before any are written. Traits without
+        observers are then written to the model in a single pass, while
+        the rest are actualized as events - one per trait. If an event
+        fails, all the changes are reverted before the error is raised.
+        """
+        traits = self.trait_index().traits
+        needs_event = self.needs_event
+        direct, events = [], []
+        for name, value in values.items():
+            if name not in traits:
+                raise TraitError("%s has no trait named %r" % (describe("the", self), name))
+            trait, value = traits[name].resolve(self, value)
+            if trait.Set is not Trait.Set or needs_event(trait, Trait.Set):
+                # the value was resolved, so it needn't be validated again
+                events.append(trait.event("Set", new=value, validated=True))
+            else:
+                direct.append((trait.model(self), trait.name, value))
+        if not events:
+            for model, name, value in direct:
+                model[name] = value
+            return
+        written = []
+        for model, name, value in direct:
+            written.append((model, name, model.get(name, Undefined)))
+            model[name] = value
+        try:
+            self._actualize_in_order(events)
+        except Exception as failure:
+            for model, name, old in written[::-1]:
+                if old is Undefined:
+                    model.pop(name, None)
+                else:
+                    model[name] = old
+            raise failure
+
     @contextmanager
-    def delayed_events(self, *include):
+    def delayed_events(self, *include, coalesce=False):
+        """Hold events until the context exits and then actualize them in order
+
+        If ``coalesce`` is True, consecutive ``Set`` and ``Del`` events on the
+        same trait are collapsed into a single event representing their net
+        change before any are actualized. An event on another trait ends the
+        run, so the order in which traits are notified is preserved.
+        """
         with self.intercepted_events(*include) as hold:
             yield hold
+        if coalesce:
+            hold[:] = self._coalesce_events(hold)
+        self._actualize_in_order(hold)
+
+    def _actualize_in_order(self, events):
+        # if an event fails, it and those before it are rolled back
         done = []
         try:
-            for event in hold:
+            for event in events:
                 self.actualize_event(event)
                 done.append(event)
         except Exception as failure:
@@ -52,6 +117,28 @@ class HasTraits(ObjectModel):
                 completed_event.rollback(self)
             raise failure
 
+    def _coalesce_events(self, events):
+        # events are held, so the model still reflects the state from before
+        # any of them occured - whether traits will have a value once earlier
+        # runs are actualized is tracked in `present`
+        net, present = [], {}
+        for event in events:
+            last = net[-1] if net else None
+            if isinstance(last, (Trait.Set, Trait.Del)):
+                if isinstance(event, (Trait.Set, Trait.Del)) and last.name == event.name:
+                    if isinstance(event, Trait.Set):
+                        net[-1] = event
+                    elif present.get(event.name, event.name in event.model(self)):
+                        net[-1] = event
+                    else:
+                        # the trait never had a value to delete
+                        net.pop()
+                    continue
+                # a different trait ends the run, preserving order
+                present[last.name] = isinstance(last, Trait.Set)
+            net.append(event)
+        return net
+
     @contextmanager
     def intercepted_events(self, *include):
         queue = []
@@ -62,26 +149,68 @@ class HasTraits(ObjectModel):
             else:
                 queue.append(event)
         self.actualize_event = hold
+        # every event must be created in order to be held
+        self.needs_event = lambda trait, etype: True
         try:
             yield queue
         except:
             raise
         finally:
             del self.actualize_event
+            del self.needs_event
 
     def actualize_event(self, event):
         raise NotImplementedError("HasTraits subclasses "
             "must define how they will handle events.")
 
+    def needs_event(self, trait, etype):
+        """Whether a change to the given trait must be actualized as an event
+
+        If not, the trait may apply the change directly to the model.
+        """
+        return True
+
 
 class Trait(TraitModel):
 
     def validate(self, obj, val):
+        if val is None and self.tags.allow_none:
+            return val
         if self.can_coerce(obj, val):
             value = self.coerce(obj, val)
         self.authorize(obj, val)
         return val
 
+    def resolve(self, obj, val):
+        """Return this trait and the value it would store if assigned ``val``"""
+        if not self.tags.writable:
+            raise TraitError(unwritable_message, obj, self.name)
+        elif val is None:
+            if not self.tags.allow_none:
+                raise TraitError(rejected_message, obj, self.name, self.info)
+            return self, val
+        else:
+            return self, self.validate(obj, val)
+
+    def accepts(self, obj, val):
+        """Whether assigning ``val`` would pass validation, without raising an error"""
+        if not self.tags.writable:
+            return False
+        elif val is None:
+            return self.tags.allow_none
+        else:
+            return self.authorizes(obj, val)
+
+    def authorizes(self, obj, val):
+        try:
+            self.authorize(obj, val)
+        except Exception:
+            # like a failed assignment, any error rejects
+            # the value so a Union can try other members
+            return False
+        else:
+            return True
+
     def can_coerce(self, obj, val):
         return False
 
@@ -91,14 +220,26 @@ class Trait(TraitModel):
     def authorize(self, obj, val):
         pass
 
+    def populate_default(self, obj):
+        default = self.validate(obj, self.cached_default(obj))
+        return self.model(obj).setdefault(self.name, default)
+
     def set_value(self, obj, val):
-        self.event_outcome("Set", obj, new=val)
+        if self.Set is Trait.Set and not obj.needs_event(self, Trait.Set):
+            # nobody will see the event so we skip making it
+            self.model(obj)[self.name] = self.validate(obj, val)
+        else:
+            self.event_outcome("Set", obj, new=val)
 
     def del_value(self, obj):
-        self.event_outcome("Del", obj)
+        if self.Del is Trait.Del and not obj.needs_event(self, Trait.Del):
+            del self.model(obj)[self.name]
+        else:
+            self.event_outcome("Del", obj)
 
     def event_outcome(self, name, obj, **attrs):
-        return obj.actualize_event(self.event(name, **attrs))
+        event = self.event(name, **attrs)
+        return obj.actualize_event(event)
 
     def event(self, name, **attrs):
         etype = getattr(self, name)
@@ -108,14 +249,21 @@ class Trait(TraitModel):
 
     class Set(Event):
 
+        __slots__ = ("trait", "status", "old", "new", "_validated")
+
         subtypename = "set"
 
+        def __init__(self, trait, validated=False, **attrs):
+            super(Trait.Set, self).__init__(trait, **attrs)
+            self._validated = validated
+
         def pending(self, obj):
             self.old = self.model(obj).get(self.name, Undefined)
 
         @between("pending", "working")
         def validating(self, obj):
-            self.new = self.trait.validate(obj, self.new)
+            if not self._validated:
+                self.new = self.trait.validate(obj, self.new)
 
         def working(self, obj):
             self.model(obj)[self.name] = self.new
@@ -123,9 +271,13 @@ class Trait(TraitModel):
         def rollback(self, obj):
             if self.old is not Undefined:
                 self.model(obj)[self.name] = self.old
+            else:
+                self.model(obj).pop(self.name, None)
 
     class Del(Event):
 
+        __slots__ = ("trait", "status", "old")
+
         subtypename = "del"
 
         def pending(self, obj):
@@ -153,9 +305,67 @@ class Trait(TraitModel):
 
 
 class Union(ProxyManyDescriptors):
+
+    # the number of value types whose last accepting member is remembered
+    matches_size = 256
+
+    def __init__(self, *descriptors, **kwargs):
+        super(Union, self).__init__(*descriptors, **kwargs)
+        self._matches = {}
+        self._matches_token = abc.get_cache_token()
+        # if every member's verdict depends only on the type of a
+        # value, then a type's match is the member to dispatch to
+        self._fused = all(getattr(d, "type_verdicts", False) for d in descriptors)
+
+    def member(self, obj, val):
+        """Get the first member which accepts the value, or None if none do"""
+        matches = self._matches
+        token = abc.get_cache_token()
+        if token != self._matches_token:
+            # ABC registrations changed
+            matches.clear()
+            self._matches_token = token
+        cls = type(val)
+        cached = matches.get(cls)
+        if cached is not None:
+            if (self._fused and val is not None and cached.tags.writable
+                    and cls is val.__class__):
+                return cached
+            elif cached.accepts(obj, val):
+                return cached
+        for d in self._descriptors:
+            if d is not cached and d.accepts(obj, val):
+                if cls is val.__class__:
+                    # proxies of different classes may share a type
+                    if len(matches) >= self.matches_size:
+                        matches.clear()
+                    matches[cls] = d
+                return d
+        return None
+
+    def resolve(self, obj, val):
+        d = self.member(obj, val)
+        if d is not None:
+            return d.resolve(obj, val)
+        errors = ErrorGroup()
+        for d in self._descriptors:
+            try:
+                return d.resolve(obj, val)
+            except Exception:
+                errors.add()
+        else:
+            errors.throw()
+
+    def __set__(self, obj, val):
+        d = self.member(obj, val)
+        if d is not None:
+            d.__set__(obj, val)
+        else:
+            # try them all to collect the errors
+            super(Union, self).__set__(obj, val)
     
     def __or__(self, other):
-        if isinstance(other, Trait):
+        if isinstance(other, Union):
             return Union(*(self.descriptors + other.descriptors))
         elif isinstance(other, Trait):
             return Union(*(self.descriptors + (other,)))
@@ -167,8 +377,13 @@ class Type(Trait):
 
     datatype = None
 
+    # the number of verdicts remembered by ``authorizes``
+    verdicts_size = 256
+
     def __init__(self, datatype=None, *args, **kwargs):
         super(Type, self).__init__(*args, **kwargs)
+        self._verdicts = {}
+        self._verdicts_token = abc.get_cache_token()
         if datatype is not None:
             if self.datatype is None or issubclass(datatype, self.datatype):
                 self.datatype = datatype
@@ -183,12 +398,31 @@ class Type(Trait):
             datatype = datatype[0] 
         return datatype(*args, **kwargs)
 
+    def verdict(self, key, check):
+        """Get a cached verdict for the given key, or cache the result of ``check(key)``
+
+        Verdicts are forgotten if an ABC registration might have changed them.
+        """
+        verdicts = self._verdicts
+        token = abc.get_cache_token()
+        if token != self._verdicts_token:
+            verdicts.clear()
+            self._verdicts_token = token
+        try:
+            return verdicts[key]
+        except KeyError:
+            result = check(key)
+            if len(verdicts) >= self.verdicts_size:
+                verdicts.clear()
+            verdicts[key] = result
+            return result
+
     def info(self):
         if isinstance(self.datatype, tuple):
             text = conjunction("or", *describe_them("a", self.datatype))
         else:
             text = describe("a", self.datatype)
-        if self.allow_none:
+        if self.tags.allow_none:
             text = "None, " + text
         return text
 
@@ -196,22 +430,47 @@ class Type(Trait):
 
 class Subclass(Type):
 
+    def authorizes(self, obj, val):
+        return isinstance(val, type) and self.verdict(val, self._is_subclass)
+
     def authorize(self, obj, val):
-        if not issubclass(val, self.datatype):
-            msg = "%s's %r attribute can be %s, not %s"
-            raise TraitError(msg % (describe("An", obj, "object"),
-                self.name, describe("a", self.datatype, "subclass"),
-                describe("the", val)))
+        if not self.authorizes(obj, val):
+            raise TraitError(rejected_message, obj, self.name,
+                functools.partial(describe, "a", self.datatype, "subclass"), val)
+
+    def _is_subclass(self, cls):
+        return issubclass(cls, self.datatype)
 
 
 class Instance(Type):
 
+    def __init__(self, *args, **kwargs):
+        super(Instance, self).__init__(*args, **kwargs)
+        datatypes = self.datatype
+        if not isinstance(datatypes, tuple):
+            datatypes = (datatypes,)
+        # verdicts depend only on the type of a value, unless
+        # a metaclass customizes how instances are checked
+        self.type_verdicts = all(type(d).__instancecheck__ in
+            _type_instancechecks for d in datatypes)
+
+    def authorizes(self, obj, val):
+        if self.type_verdicts:
+            cls = type(val)
+            # proxies and mocks may claim another __class__
+            if cls is val.__class__:
+                return self.verdict(cls, self._is_instance_type)
+        return isinstance(val, self.datatype)
+
     def authorize(self, obj, val):
-        if not isinstance(val, self.datatype):
-            msg = "%s's %r attribute can be %s, not %s"
-            raise TraitError(msg % (describe("An", obj, "object"),
-                self.name, describe("a", self.datatype),
-                describe("the", val)))
+        if not self.authorizes(obj, val):
+            raise TraitError(rejected_message, obj, self.name, self.info, val)
+
+    def _is_instance_type(self, cls):
+        return issubclass(cls, self.datatype)
+
+
+_type_instancechecks = (type.__instancecheck__, abc.ABCMeta.__instancecheck__)
 
 
 class This(Instance):
@@ -56,10 +56,15 @@ def copy_mapping(m):
 class ErrorGroup(object):
 
     def __init__(self):
-        self.tracebacks = []
+        self.errors = []
 
     def add(self):
-        self.tracebacks.append(traceback.format_exc())
+        # tracebacks are only formatted if thrown
+        self.errors.append(sys.exc_info())
+
+    @property
+    def tracebacks(self):
+        return ["".join(traceback.format_exception(*e)) for e in self.errors]
 
     def throw(self):
         msg = "The following exceptions occured:\n\n"
@@ -67,7 +72,7 @@ class ErrorGroup(object):
         raise Exception(msg)
 
     def __len__(self):
-        return len(self.tracebacks)
+        return len(self.errors)
 
 
 class Sentinel(object):
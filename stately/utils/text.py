@@ -16,6 +16,11 @@ def fullname(cls, attr=None):
     return name
 
 
+# the number of class descriptions remembered by ``describe``
+describe_cache_size = 1024
+_class_descriptions = {}
+
+
 def describe(article, value, name=None, verbose=False, capital=None):
     """Return string that describes a value
 
@@ -73,6 +78,26 @@ def describe(article, value, name=None, verbose=False, capital=None):
     >>> describe("the", object, "I will use")
     'the object I will use'
     """
+    if inspect.isclass(value):
+        # descriptions of classes don't change, and
+        # are frequently requested for error messages
+        key = (article, value, name, verbose, capital)
+        try:
+            return _class_descriptions[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # an unhashable class or name
+            return _describe(article, value, name, verbose, capital)
+        result = _describe(article, value, name, verbose, capital)
+        if len(_class_descriptions) >= describe_cache_size:
+            _class_descriptions.clear()
+        _class_descriptions[key] = result
+        return result
+    return _describe(article, value, name, verbose, capital)
+
+
+def _describe(article, value, name, verbose, capital):
     if capital is None and article is not None:
         capital = article[0].lower() != article[0]
 
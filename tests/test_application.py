@@ -0,0 +1,45 @@
+import logging
+
+from stately import Instance
+from stately.app.application import Application, log_level
+
+
+class Recorder(logging.Handler):
+
+    def __init__(self):
+        super(Recorder, self).__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class App(Application):
+
+    name = "test"
+    value = Instance(int).tag(log="info")
+
+
+def make_app():
+    app = App()
+    recorder = Recorder()
+    app.logger.addHandler(recorder)
+    return app, recorder
+
+
+def test_log_level_names():
+    assert log_level("debug") == logging.DEBUG
+    assert log_level(logging.INFO) == logging.INFO
+
+
+def test_changing_the_level_applies_to_cached_checks():
+    app, recorder = make_app()
+    app.logger_level = logging.WARNING
+    app.value = 1
+    assert not app.logger.isEnabledFor(logging.INFO)
+    app.logger_level = logging.INFO
+    assert app.logger.isEnabledFor(logging.INFO)
+    app.value = 2
+    record, = recorder.records
+    assert record.stately_event["new"] == 2
+    assert "new" in record.getMessage()
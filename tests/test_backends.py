@@ -0,0 +1,65 @@
+import gc
+
+import pytest
+
+from stately import Stately, Instance
+from stately.base.backends import CompactBackend, SlotsBackend, StructBackend
+
+
+def make_class(backend):
+
+    class Record(Stately):
+        model_backend = backend()
+        count = Instance(int)
+        ratio = Instance(float)
+        flag = Instance(bool)
+        label = Instance(str)
+        _hidden = Instance(int)
+
+    return Record
+
+
+backends = [CompactBackend, SlotsBackend, StructBackend]
+
+
+@pytest.mark.parametrize("backend", backends)
+def test_values_round_trip(backend):
+    r = make_class(backend)()
+    r.count, r.ratio, r.flag, r.label, r._hidden = 1, 0.5, True, "a", 2
+    assert r.trait_values() == {"count": 1, "ratio": 0.5,
+        "flag": True, "label": "a", "_hidden": 2}
+    del r.count
+    assert not r.has_trait_value("count")
+    assert r.count == 0
+    assert sorted(r._model) == ["_hidden", "count", "flag", "label", "ratio"]
+
+
+@pytest.mark.parametrize("backend", backends)
+def test_traits_added_later_have_a_place(backend):
+    cls = make_class(backend)
+    before = cls()
+    cls.extra = Instance(int)
+    after = cls()
+    after.extra = 3
+    assert after.extra == 3
+    before.count = 1
+    assert before.count == 1
+
+
+def test_struct_values_which_do_not_fit():
+    r = make_class(StructBackend)()
+    r.count = 2 ** 70
+    assert r.count == 2 ** 70
+    r.count = 5
+    assert r.count == 5 and r._model.overflow == {}
+
+
+def test_struct_records_are_reused_cleared():
+    cls = make_class(StructBackend)
+    r = cls()
+    r.count = 7
+    arena = r._model.arena
+    del r
+    gc.collect()
+    assert not cls().has_trait_value("count")
+    assert len(arena.pages) == 1
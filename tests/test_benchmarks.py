@@ -0,0 +1,25 @@
+import os
+import importlib.util
+
+here = os.path.dirname(os.path.abspath(__file__))
+path = os.path.join(os.path.dirname(here), "benchmarks", "run.py")
+spec = importlib.util.spec_from_file_location("benchmarks_run", path)
+run = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(run)
+
+
+def test_every_case_runs():
+    results = run.run(list(run.cases), repeat=1, scale=0.001)
+    assert set(results) == set(run.cases)
+    assert all(r["best"] > 0 for r in results.values())
+
+
+def test_missing_apis_are_reported_as_unavailable(monkeypatch, capsys):
+
+    def missing():
+        return run.Stately().missing_api
+
+    monkeypatch.setitem(run.cases, "missing", (missing, 1))
+    results = run.run(["get", "missing"], repeat=1, scale=0.001)
+    assert list(results) == ["get"]
+    assert "n/a" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+import pytest
+
+from stately import Stately, Trait, Instance, Undefined
+from stately.base.events import Engine
+
+
+class Steps(Engine):
+
+    blueprint = {None: "first", "first": "second", "second": "third", "third": None}
+
+    def __init__(self):
+        self.ran = []
+
+    def first(self, value):
+        self.ran.append("first")
+        return value
+
+    def second(self, value):
+        self.ran.append("second")
+
+    def third(self, value):
+        self.ran.append("third")
+        return value * 2
+
+
+def test_execute_only_notifies_observed_statuses():
+    engine = Steps()
+    notified = []
+    result = engine.execute({"second"}, lambda e: notified.append(e.status), 3)
+    assert engine.ran == ["first", "second", "third"]
+    assert notified == ["second"]
+    assert result == 6
+    assert engine.status is None
+
+
+def test_execute_refuses_an_engine_in_progress():
+    engine = Steps()
+    def notify(e):
+        e.execute(set(), notify, 1)
+    with pytest.raises(RuntimeError):
+        engine.execute({"first"}, notify, 1)
+
+
+def test_pipelines_are_recompiled_when_stages_change():
+
+    class Local(Steps):
+        pass
+
+    class Doubled(Local):
+        pass
+
+    assert [s for s, m in Doubled._pipeline] == ["first", "second", "third"]
+    Local.second = staticmethod(lambda value: value + 1)
+    engine = Doubled()
+    assert engine.execute(set(), None, 3) == 6
+    assert engine.ran == ["first", "third"]
+    Doubled.blueprint = {None: "first", "first": None}
+    assert Doubled().execute(set(), None, 3) == 3
+    del Doubled.blueprint
+    del Local.second
+    engine = Doubled()
+    assert engine.execute(set(), None, 3) == 6
+    assert engine.ran == ["first", "second", "third"]
+
+
+def test_crank_runs_the_same_pipeline():
+    engine = Steps()
+    turn = engine.crank(3)
+    with pytest.raises(StopIteration):
+        while True:
+            turn()
+    assert engine.ran == ["first", "second", "third"]
+
+
+def test_trait_events_are_slotted():
+
+    class Point(Stately):
+        x = Instance(int)
+
+    events = []
+    p = Point()
+    p.observe("x", observer=lambda obj, event: events.append(event))
+    p.x = 1
+    del p.x
+    set_event, del_event = events
+    for event in events:
+        assert not hasattr(event, "__dict__")
+    assert isinstance(set_event, Trait.Set) and isinstance(del_event, Trait.Del)
+    assert set_event.attributes() == {"name": "x", "trait": Point.x,
+        "status": None, "old": Undefined, "new": 1}
+    assert "'new': 1" in repr(set_event)
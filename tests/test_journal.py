@@ -0,0 +1,108 @@
+from stately import Stately, Trait, Instance, Undefined
+from stately.journal import Journal, records, replay, rebuild
+
+
+class Point(Stately):
+
+    x = Instance(int)
+    y = Instance(int)
+    label = Instance(str).tag(writable=False)
+    anything = Trait()
+    value = Instance(int) | Instance(str)
+    optional = Instance(int).tag(allow_none=True)
+
+
+def journal_path(tmpdir):
+    return str(tmpdir.join("points.journal"))
+
+
+def test_round_trip(tmpdir):
+    path = journal_path(tmpdir)
+    a, b = Point(), Point()
+    Point.label.set_value(a, "a")
+    with Journal(path, batch_size=2) as journal:
+        journal.track(a, "a")
+        journal.track(b, "b")
+        a.x = 1
+        a.y = 2
+        b.x = 3
+        a.x = 4
+        del b.x
+    points = rebuild(path, lambda key: Point())
+    assert points["a"].x == 4
+    assert points["a"].y == 2
+    assert points["a"].label == "a"
+    assert not points["b"].has_trait_value("x")
+
+
+def test_rebuild_union(tmpdir):
+    path = journal_path(tmpdir)
+    a, b = Point(), Point()
+    with Journal(path) as journal:
+        journal.track(a, "a")
+        journal.track(b, "b")
+        a.value = 1
+        b.value = "b"
+    points = rebuild(path, lambda key: Point())
+    assert points["a"].value == 1
+    assert points["b"].value == "b"
+
+
+def test_none_is_recorded(tmpdir):
+    path = journal_path(tmpdir)
+    p = Point()
+    with Journal(path) as journal:
+        journal.track(p, "p")
+        p.optional = 5
+        p.optional = None
+    assert replay(path) == {"p": {"optional": None}}
+    assert rebuild(path, lambda key: Point())["p"].optional is None
+
+
+def test_snapshot_does_not_record_defaults(tmpdir):
+    path = journal_path(tmpdir)
+    p = Point()
+    with Journal(path) as journal:
+        journal.track(p, "p")
+    assert not p.has_trait_value("x")
+    assert replay(path) == {"p": {}}
+    rebuilt = rebuild(path, lambda key: Point())["p"]
+    assert rebuilt.anything is Undefined
+
+
+def test_snapshot_interval(tmpdir):
+    path = journal_path(tmpdir)
+    p = Point()
+    with Journal(path, snapshot_interval=3) as journal:
+        journal.track(p, "p", snapshot=False)
+        for i in range(7):
+            p.x = i
+    snapshots = [r for r in records(path) if r[2] is None]
+    assert len(snapshots) == 2
+    assert replay(path) == {"p": {"x": 6}}
+
+
+def test_incomplete_frame_is_ignored(tmpdir):
+    path = journal_path(tmpdir)
+    p = Point()
+    with Journal(path) as journal:
+        journal.track(p, "p")
+        p.x = 1
+    with open(path, "ab") as f:
+        f.write(b"\x10\x00\x00\x00\x01\x00\x00\x00abc")
+    assert replay(path) == {"p": {"x": 1}}
+
+
+def test_append_after_incomplete_frame(tmpdir):
+    path = journal_path(tmpdir)
+    p = Point()
+    with Journal(path) as journal:
+        journal.track(p, "p")
+        p.x = 1
+    with open(path, "ab") as f:
+        # a crash while writing the next frame
+        f.write(b"\x10\x00\x00\x00\x01\x00\x00\x00abc")
+    with Journal(path) as journal:
+        journal.track(p, "p", snapshot=False)
+        p.x = 2
+    assert replay(path) == {"p": {"x": 2}}
@@ -0,0 +1,139 @@
+import pickle
+
+import pytest
+
+from stately import Stately, Instance, Undefined
+from stately.base.model import TraitError
+
+
+class Settings(Stately):
+
+    b = Instance(int).tag(setting=True)
+    a = Instance(str).tag(setting=True)
+    c = Instance(int)
+    u = Instance(int) | Instance(str)
+
+
+def test_trait_names_are_sorted():
+    assert Settings.trait_names() == ("a", "b", "c", "u")
+    assert Settings.trait_names(setting=True) == ("a", "b")
+    assert Settings.has_trait("u")
+    assert not Settings.has_trait("missing")
+
+
+def test_retagging_refreshes_the_index():
+
+    class Retagged(Settings):
+        pass
+
+    Retagged.c.tag(setting=True)
+    assert Retagged.trait_names(setting=True) == ("a", "b", "c")
+    Retagged.u.tag(setting=True)
+    assert Retagged.trait_names(setting=True) == ("a", "b", "c", "u")
+    Retagged.c.tag(setting=False)
+    Retagged.u.tag(setting=False)
+    assert Settings.trait_names(setting=True) == ("a", "b")
+
+
+def test_traits_added_later_are_indexed():
+
+    class Extended(Settings):
+        pass
+
+    assert "d" not in Extended.trait_names()
+    Extended.d = Instance(int)
+    assert Extended.trait_names() == ("a", "b", "c", "d", "u")
+    assert "d" not in Settings.trait_names()
+
+
+def test_descriptor_registry_follows_class_changes():
+
+    class Base(Stately):
+        x = Instance(int)
+
+    class Child(Base):
+        y = Instance(int)
+
+    assert [k for k, v in Child._descriptors_] == ["x", "y"]
+    Base.z = Instance(int)
+    assert [k for k, v in Child._descriptors_] == ["x", "y", "z"]
+    del Base.x
+    assert [k for k, v in Child._descriptors_] == ["y", "z"]
+    c = Child()
+    c.y = c.z = 1
+    assert c.trait_values() == {"y": 1, "z": 1}
+
+
+def test_trait_errors_render_lazily():
+    rendered = []
+
+    def render(name):
+        rendered.append(name)
+        return "%r was rejected" % name
+
+    error = TraitError(render, "x")
+    assert rendered == []
+    assert str(error) == "'x' was rejected"
+    assert error.args == ("'x' was rejected",)
+    assert repr(TraitError(render, "y")) == "TraitError(\"'y' was rejected\")"
+    assert str(pickle.loads(pickle.dumps(TraitError(render, "z")))) == "'z' was rejected"
+    assert rendered == ["x", "y", "z"]
+    assert TraitError("plain").args == ("plain",)
+
+
+def test_rejections_caught_by_a_union_are_never_rendered():
+    calls = []
+
+    class Noted(Instance):
+        def info(self):
+            calls.append(self)
+            return super(Noted, self).info()
+
+    class Either(Stately):
+        value = Noted(int) | Instance(str)
+
+    e = Either()
+    e.value = "a"
+    assert Either.value.resolve(e, "b")[1] == "b"
+    assert calls == []
+    with pytest.raises(Exception):
+        e.value = []
+    assert calls
+
+
+class Defaults(Stately):
+
+    number = Instance(int)
+    items = Instance(list)
+    stamp = Instance(int, lambda: next(stamps))
+    shared = Instance(int, lambda: next(stamps)).tag(cache_default=True)
+    announced = Instance(int).tag(default_event=True)
+    named = Instance(int, "_next_stamp").tag(cache_default=True)
+
+    def _next_stamp(self):
+        return next(stamps)
+
+
+stamps = iter(range(1000))
+
+
+def test_defaults_are_stored_without_events():
+    d = Defaults()
+    events = []
+    d.observe(observer=lambda obj, event: events.append(event.name))
+    assert d.number == 0
+    assert d.has_trait_value("number")
+    assert events == []
+    assert d.announced == 0
+    assert events == ["announced"]
+
+
+def test_only_shareable_defaults_are_cached():
+    a, b = Defaults(), Defaults()
+    assert a.items is not b.items
+    assert a.stamp != b.stamp
+    assert a.shared == b.shared
+    assert a.named != b.named
+    assert Defaults.number._default_cache == 0
+    Defaults.shared.tag(cache_default=True)
+    assert Defaults.shared._default_cache is Undefined
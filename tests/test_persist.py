@@ -0,0 +1,84 @@
+import gc
+import warnings
+
+import pytest
+
+from stately import Stately, Instance
+from stately.persist import snapshot, Snapshot
+
+
+class Point(Stately):
+
+    x = Instance(int)
+    y = Instance(float)
+    label = Instance(str)
+
+
+class Other(Stately):
+
+    x = Instance(int)
+
+
+def snapshot_path(tmpdir):
+    return str(tmpdir.join("points.snapshot"))
+
+
+def test_failed_open_closes_the_file(tmpdir):
+    path = snapshot_path(tmpdir)
+    p = Point()
+    p.x = 1
+    snapshot(path, [p])
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with pytest.raises(ValueError):
+            Snapshot(path, Other)
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+def saved_points(path):
+    a, b, c = Point(), Point(), Point()
+    a.x, a.y, a.label = 1, 0.5, "a"
+    b.x = 2 ** 70
+    snapshot(path, [a, b, c])
+
+
+def test_values_round_trip(tmpdir):
+    path = snapshot_path(tmpdir)
+    saved_points(path)
+    with Snapshot(path, Point) as points:
+        a, b, c = points
+        assert (a.x, a.y, a.label) == (1, 0.5, "a")
+        assert b.x == 2 ** 70
+        assert not b.has_trait_value("y")
+        assert not c.has_trait_value("x")
+
+
+def test_writable_snapshots_change_the_file(tmpdir):
+    path = snapshot_path(tmpdir)
+    saved_points(path)
+    with Snapshot(path, Point) as points:
+        points[0].x = 10
+        points[2].y = 1.5
+    with Snapshot(path, Point, writable=False) as points:
+        assert points[0].x == 10
+        assert points[2].y == 1.5
+
+
+def test_read_only_snapshots_refuse_changes_to_saved_values(tmpdir):
+    path = snapshot_path(tmpdir)
+    saved_points(path)
+    with Snapshot(path, Point, writable=False) as points:
+        with pytest.raises(TypeError):
+            points[0].x = 10
+        with pytest.raises(TypeError):
+            del points[0].y
+        points[2].x = 3
+        assert points[2].x == 3
+        points[0].label = "b"
+        assert points[0].label == "b"
+
+
+def test_snapshots_of_mixed_classes_are_refused(tmpdir):
+    with pytest.raises(TypeError):
+        snapshot(snapshot_path(tmpdir), [Point(), Other()])
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from stately import Stately, Instance
+from stately.profiling import Profile
+
+
+class Point(Stately):
+
+    x = Instance(int)
+    y = Instance(int)
+
+
+def moved(obj, event):
+    pass
+
+
+def test_profiles_count_events_and_time_observers():
+    p = Point()
+    p.observe("x", observer=moved)
+    with Profile() as profile:
+        p.x = 1
+        p.x = 2
+        p.y = 1
+    p.x = 3
+    snapshot = profile.snapshot()
+    assert [(e["trait"], e["event"], e["count"]) for e in snapshot["events"]] == [
+        ("x", "set event", 2)]
+    assert {s["status"] for s in snapshot["statuses"]} == {"pending", "validating", "working"}
+    observer, = snapshot["observers"]
+    assert observer["observer"] == __name__ + ".moved"
+    assert observer["calls"] == 2
+
+
+def test_all_events_counts_unobserved_traits():
+    p = Point()
+    with Profile(all_events=True) as profile:
+        p.y = 1
+    assert profile.snapshot()["events"][0]["trait"] == "y"
+
+
+def test_only_one_profile_is_enabled():
+    with Profile() as profile:
+        assert profile.enabled
+        with pytest.raises(RuntimeError):
+            Profile().enable()
+    assert not profile.enabled
+
+
+def test_export(tmpdir):
+    p = Point()
+    p.observe("x", observer=moved)
+    with Profile() as profile:
+        p.x = 1
+    path = str(tmpdir.join("profile"))
+    profile.export(path)
+    with open(path) as f:
+        assert json.load(f) == profile.snapshot()
+    profile.export(path, format="prometheus")
+    with open(path) as f:
+        text = f.read()
+    assert 'stately_events_total{class="%s.Point",trait="x",event="set event"} 1' % __name__ in text
+    with pytest.raises(ValueError):
+        profile.export(path, format="yaml")
@@ -0,0 +1,282 @@
+import gc
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stately import Stately, AsyncStately, ThreadSafeStately, Instance, Undefined
+from stately.stately import ObserverErrors
+
+
+class Counter(ThreadSafeStately):
+
+    count = Instance(int)
+    items = Instance(list, "_make_items")
+
+    def _make_items(self):
+        # give other threads a chance to make their own
+        time.sleep(0.01)
+        return []
+
+
+def run_threads(*targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_only_thread_safe_objects_lock_their_observers():
+    plain, safe = Stately(), Counter()
+    lock_type = type(threading.RLock())
+    assert not isinstance(plain._observers.lock, lock_type)
+    assert isinstance(safe._observers.lock, lock_type)
+
+
+def test_threads_share_the_first_default():
+    c = Counter()
+    seen = []
+    run_threads(*[lambda: seen.append(c.items)] * 4)
+    assert all(items is c.items for items in seen)
+
+
+def test_observed_assignments_from_many_threads():
+    c = Counter()
+    c.count = 0
+    calls = []
+    c.observe("count", observer=lambda obj, event: calls.append(event.new))
+
+    def increment():
+        for i in range(200):
+            with c.locked():
+                c.count += 1
+
+    def churn():
+        for i in range(200):
+            c.observe("count", observer=lambda obj, event: None).remove()
+
+    run_threads(increment, increment, increment, increment, churn)
+    assert c.count == 800
+    assert calls == list(range(1, 801))
+
+
+class Point(Stately):
+
+    x = Instance(int)
+    y = Instance(int)
+
+
+def test_dispatch_follows_observer_changes():
+    p = Point()
+    calls = []
+    p.observe("x", observer=lambda obj, event: calls.append(("x", event.new)))
+    p.observe(observer=lambda obj, event: calls.append(("all", event.name)))
+    p.x = 1
+    p.y = 2
+    assert calls == [("x", 1), ("all", "x"), ("all", "y")]
+    handle = p.observe("y", "set event", observer=lambda obj, event: calls.append("y"))
+    del calls[:]
+    p.y = 3
+    del p.y
+    assert calls == [("all", "y"), "y", ("all", "y")]
+    handle.remove()
+    del calls[:]
+    p.y = 4
+    assert calls == [("all", "y")]
+
+
+def test_observers_of_a_status():
+    p = Point()
+    statuses = []
+    p.observe("x", statuses="pending",
+        observer=lambda obj, event: statuses.append((event.status, event.old)))
+    p.x = 1
+    p.x = 2
+    assert statuses == [("pending", Undefined), ("pending", 1)]
+
+
+class Listener(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def heard(self, obj, event):
+        self.calls.append(event.new)
+
+
+def test_weak_observers_are_removed_once_collected():
+    p = Point()
+    listener = Listener()
+    p.observe("x", observer=listener.heard, weak=True)
+    p.observe("x", observer=lambda obj, event: None)
+    p.x = 1
+    assert listener.calls == [1]
+    stats = p.observer_stats()
+    assert (stats["strong"], stats["weak"], stats["dead"]) == (1, 1, 0)
+    del listener
+    gc.collect()
+    stats = p.observer_stats()
+    assert (stats["strong"], stats["weak"], stats["dead"]) == (1, 0, 0)
+    p.x = 2
+
+
+def test_observer_handles_and_owners():
+    p = Point()
+    calls = []
+    owner = object()
+    observer = lambda obj, event: calls.append(event.name)
+    first = p.observe(["x", "y"], observer=observer)
+    second = p.observe("x", observer=observer, owner=owner)
+    p.x = 1
+    assert calls == ["x", "x"]
+    assert first.active and len(first.components) == 2
+    p.unobserve(first)
+    assert not first.active
+    p.x = 2
+    p.y = 2
+    assert calls == ["x", "x", "x"]
+    p.unobserve_all(owner)
+    assert not second.active
+    p.x = 3
+    assert calls == ["x", "x", "x"]
+    assert p.observer_stats()["handles"] == 0
+
+
+class AsyncPoint(AsyncStately):
+
+    x = Instance(int)
+
+
+def run_async(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_set_async_awaits_observers():
+    p = AsyncPoint()
+    calls = []
+
+    async def observer(obj, event):
+        await asyncio.sleep(0)
+        calls.append(event.new)
+
+    p.observe("x", observer=observer)
+    p.observe("x", observer=observer)
+    run_async(p.set_async("x", 1))
+    assert calls == [1, 1]
+
+
+def test_observer_concurrency_is_limited():
+
+    class Limited(AsyncPoint):
+        observer_concurrency = 2
+
+    p = Limited()
+    running, peak = [], []
+
+    async def observer(obj, event):
+        running.append(None)
+        peak.append(len(running))
+        await asyncio.sleep(0)
+        running.pop()
+
+    for i in range(5):
+        p.observe("x", observer=observer)
+    run_async(p.set_async("x", 1))
+    assert len(peak) == 5 and max(peak) == 2
+
+
+def test_set_async_raises_every_observer_error():
+    p = AsyncPoint()
+
+    async def fail(obj, event):
+        raise ValueError(event.new)
+
+    p.observe("x", observer=fail)
+    p.observe("x", observer=fail)
+    with pytest.raises(ObserverErrors) as info:
+        run_async(p.set_async("x", 1))
+    assert len(info.value.errors) == 2
+
+
+def test_drain_awaits_observers_of_synchronous_events():
+    p = AsyncPoint()
+    calls = []
+
+    async def observer(obj, event):
+        await asyncio.sleep(0)
+        if event.new < 0:
+            raise ValueError(event.new)
+        calls.append(event.new)
+
+    p.observe("x", observer=observer)
+
+    async def assign():
+        p.x = 1
+        p.x = -1
+        await p.drain()
+
+    with pytest.raises(ObserverErrors) as info:
+        run_async(assign())
+    assert calls == [1]
+    assert len(info.value.errors) == 1
+    with pytest.raises(RuntimeError):
+        p.x = 2
+
+
+def test_offloaded_observers_run_in_order():
+    p = Point()
+    calls, threads = [], []
+
+    def observer(obj, event):
+        threads.append(threading.current_thread())
+        calls.append(event.new)
+
+    p.observe("x", observer=observer, executor="thread")
+    for i in range(20):
+        p.x = i
+    assert p.flush(timeout=5)
+    assert calls == list(range(20))
+    assert threading.current_thread() not in threads
+
+
+def test_flush_raises_offloaded_errors_from_every_executor():
+    p = Point()
+    other = ThreadPoolExecutor(1)
+
+    def fail(obj, event):
+        raise ValueError(event.new)
+
+    p.observe("x", observer=fail, executor="thread")
+    p.observe("x", observer=fail, executor=other)
+    p.x = 1
+    with pytest.raises(ObserverErrors) as info:
+        p.flush(timeout=5)
+    assert len(info.value.errors) == 2
+    assert p.flush()
+    other.shutdown()
+
+
+def test_only_completed_events_can_be_offloaded():
+    p = Point()
+    with pytest.raises(ValueError):
+        p.observe("x", statuses="pending", observer=lambda obj, event: None,
+            executor="thread")
+
+
+def test_dead_offloaded_weak_observers_are_pruned():
+    p = Point()
+    listener = Listener()
+    p.observe("x", observer=listener.heard, weak=True, executor="thread")
+    p.x = 1
+    p.flush(timeout=5)
+    assert listener.calls == [1]
+    del listener
+    gc.collect()
+    assert p.observer_stats()["handles"] == 0
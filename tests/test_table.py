@@ -0,0 +1,59 @@
+import gc
+
+from stately import Stately, Instance
+from stately.table import StatelyTable, ColumnSet
+
+
+class Point(Stately):
+
+    x = Instance(int)
+    y = Instance(float)
+    label = Instance(str)
+
+
+def test_rows_read_and_write_columns():
+    t = StatelyTable(Point, [{"x": 1, "label": "a"}, {"x": 2, "y": 0.5}])
+    assert len(t) == 2
+    assert t[0].x == 1 and t[0].label == "a"
+    assert t[1].y == 0.5
+    t[1].x = 3
+    assert t.column("x").get(1) == 3
+    assert t[-1] is t[1]
+
+
+def test_observers_of_collected_row_views():
+    t = StatelyTable(Point, [{"x": 1}, {"x": 2}])
+    calls = []
+    handle = t[0].observe("x", observer=lambda obj, event: calls.append(event.new))
+    gc.collect()
+    t[0].x = 5
+    t[1].x = 6
+    assert calls == [5]
+    handle.remove()
+    gc.collect()
+    t[0].x = 7
+    assert calls == [5]
+    assert not t._row_observers
+
+
+def test_assign_notifies_table_observers_once():
+    t = StatelyTable(Point, [{"x": i} for i in range(3)])
+    events = []
+    t.observe(lambda table, event: events.append(event))
+    t.assign("x", [10, 11], rows=[0, 2])
+    assert [row.x for row in t] == [10, 1, 11]
+    event, = events
+    assert isinstance(event, ColumnSet)
+    assert event.rows == [0, 2] and event.old == [0, 2] and event.new == [10, 11]
+
+
+def test_failed_append_is_rolled_back():
+    t = StatelyTable(Point, [{"x": 1}])
+    try:
+        t.append(x="not an int")
+    except Exception:
+        pass
+    else:
+        assert False, "expected the append to fail"
+    assert len(t) == 1
+    assert all(len(c.present) == 1 for c in t.columns.values())
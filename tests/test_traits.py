@@ -0,0 +1,253 @@
+import abc
+import weakref
+from unittest import mock
+
+import pytest
+
+from stately import Stately, Trait, Instance
+from stately.traits import TraitError
+
+
+class Foo(object):
+    pass
+
+
+class Bar(object):
+    pass
+
+
+class Recorded(Stately):
+
+    x = Instance(int)
+
+    def __init__(self):
+        self.actualized = []
+        super(Recorded, self).__init__()
+
+    def actualize_event(self, event):
+        self.actualized.append(event)
+        return super(Recorded, self).actualize_event(event)
+
+
+class Holder(Stately):
+
+    foo = Instance(Foo)
+    either = Instance(Foo) | Instance(Bar)
+
+
+def test_instance_accepts_mocks_of_its_class():
+    value = mock.Mock(spec=Foo)
+    h = Holder()
+    h.foo = Foo()
+    h.foo = value
+    assert h.foo is value
+
+
+def test_instance_accepts_proxies_of_its_class():
+    foo = Foo()
+    value = weakref.proxy(foo)
+    h = Holder()
+    h.foo = Foo()
+    h.foo = value
+    assert h.foo is value
+
+
+def test_union_dispatches_proxies_by_their_class():
+    foo, bar = Foo(), Bar()
+    h = Holder()
+    h.either = weakref.proxy(bar)
+    h.either = weakref.proxy(foo)
+    assert isinstance(h.either, Foo)
+    h.either = mock.Mock(spec=Bar)
+    h.either = mock.Mock(spec=Foo)
+    assert isinstance(h.either, Foo)
+
+
+def test_instance_rejects_other_types():
+    h = Holder()
+    with pytest.raises(TraitError):
+        h.foo = Bar()
+    with pytest.raises(TraitError):
+        h.foo = mock.Mock(spec=Bar)
+
+
+def test_unobserved_assignment_skips_events():
+    r = Recorded()
+    r.x = 1
+    del r.x
+    assert r.actualized == []
+    with pytest.raises(TraitError):
+        r.x = "not an int"
+    calls = []
+    r.observe("x", observer=lambda obj, event: calls.append(event.new))
+    r.x = 2
+    assert [e.new for e in r.actualized] == [2] and calls == [2]
+
+
+class Counted(Instance):
+
+    def __init__(self, *args, **kwargs):
+        super(Counted, self).__init__(*args, **kwargs)
+        self.checks = 0
+
+    def authorize(self, obj, val):
+        self.checks += 1
+        super(Counted, self).authorize(obj, val)
+
+
+class Batch(Stately):
+
+    a = Instance(int)
+    b = Counted(int)
+    c = Instance(str)
+
+
+def test_update_validates_everything_first():
+    batch = Batch()
+    batch.update(a=1, c="c")
+    with pytest.raises(TraitError):
+        batch.update(a=2, c=3)
+    assert batch.trait_values() == {"a": 1, "b": 0, "c": "c"}
+    with pytest.raises(TraitError):
+        batch.update(missing=1)
+
+
+def test_update_rolls_back_when_an_observer_fails():
+    batch = Batch()
+    batch.update(a=1, b=1)
+
+    def fail(obj, event):
+        raise ValueError("rejected")
+
+    batch.observe("b", observer=fail)
+    with pytest.raises(ValueError):
+        batch.update(a=2, b=2, c="c")
+    assert batch.a == 1 and batch.b == 1
+    assert not batch.has_trait_value("c")
+
+
+def test_update_validates_observed_values_once():
+    batch = Batch()
+    events = []
+    batch.observe("b", observer=lambda obj, event: events.append(event.new))
+    checks = Batch.b.checks
+    batch.update(b=5)
+    assert Batch.b.checks == checks + 1
+    assert events == [5]
+
+
+def test_coalesced_events_keep_the_order_of_traits():
+    batch = Batch()
+    batch.update(a=0, b=0)
+    events = []
+    batch.observe(observer=lambda obj, event: events.append(
+        (event.name, event.typename, getattr(event, "new", None))))
+    with batch.delayed_events(coalesce=True):
+        batch.a = 1
+        batch.a = 2
+        batch.b = 1
+        batch.a = 3
+        del batch.a
+    assert events == [("a", "set event", 2), ("b", "set event", 1),
+        ("a", "del event", None)]
+    assert not batch.has_trait_value("a")
+
+
+def test_coalescing_drops_values_set_and_deleted_in_the_block():
+    batch = Batch()
+    events = []
+    batch.observe(observer=lambda obj, event: events.append(event.name))
+    with batch.delayed_events(coalesce=True):
+        batch.c = "c"
+        del batch.c
+        batch.a = 1
+    assert events == ["a"]
+    assert not batch.has_trait_value("c")
+
+
+def test_delayed_events_without_coalescing():
+    batch = Batch()
+    events = []
+    batch.observe("a", observer=lambda obj, event: events.append(event.new))
+    with batch.delayed_events():
+        batch.a = 1
+        batch.a = 2
+        assert events == []
+    assert events == [1, 2]
+
+
+class Positive(Instance):
+
+    def authorize(self, obj, val):
+        super(Positive, self).authorize(obj, val)
+        if val <= 0:
+            raise TraitError("%r is not positive" % val)
+
+
+class Compared(Trait):
+
+    def authorize(self, obj, val):
+        # comparing a str with 0 raises a TypeError
+        if val <= 0:
+            raise TraitError("%r is not positive" % val)
+
+
+class Choice(Stately):
+
+    value = Positive(int) | Instance(str) | Instance(float).tag(allow_none=True)
+    compared = Compared() | Instance(str)
+
+
+def test_union_dispatches_to_the_accepting_member():
+    c = Choice()
+    for value in [1, "a", 1.5, 2, None, "b"]:
+        c.value = value
+        assert c.value == value
+    trait, value = Choice.value.resolve(c, "x")
+    assert trait is Choice.value.descriptors[1]
+
+
+def test_union_collects_the_errors_of_every_member():
+    c = Choice()
+    with pytest.raises(Exception) as info:
+        c.value = -1
+    assert "-1 is not positive" in str(info.value)
+    with pytest.raises(Exception):
+        Choice.value.resolve(c, [])
+
+
+def test_any_error_from_authorize_rejects_a_member():
+    c = Choice()
+    c.compared = 1
+    c.compared = "a"
+    assert c.compared == "a"
+    assert Choice.compared.member(c, "a") is Choice.compared.descriptors[1]
+
+
+def test_verdicts_follow_abc_registration_and_instance_checks():
+
+    class Shape(metaclass=abc.ABCMeta):
+        pass
+
+    class Circle(object):
+        pass
+
+    class Even(type):
+        def __instancecheck__(cls, val):
+            return isinstance(val, int) and val % 2 == 0
+
+    class EvenNumber(metaclass=Even):
+        pass
+
+    class Drawing(Stately):
+        shape = Instance(Shape)
+        even = Instance(EvenNumber)
+
+    d = Drawing()
+    with pytest.raises(TraitError):
+        d.shape = Circle()
+    Shape.register(Circle)
+    d.shape = Circle()
+    d.even = 2
+    with pytest.raises(TraitError):
+        d.even = 3
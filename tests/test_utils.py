@@ -0,0 +1,31 @@
+from stately.utils import text
+from stately.utils import describe
+
+
+class Widget(object):
+    pass
+
+
+def test_class_descriptions_are_cached():
+    text._class_descriptions.clear()
+    assert describe("a", Widget) == "a Widget"
+    assert describe("the", Widget) == "the type %s.Widget" % __name__
+    assert describe("A", Widget) == "A Widget"
+    cached = len(text._class_descriptions)
+    assert describe("a", Widget) == "a Widget"
+    assert describe("the", Widget) == "the type %s.Widget" % __name__
+    assert len(text._class_descriptions) == cached
+
+
+def test_the_description_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(text, "describe_cache_size", 4)
+    text._class_descriptions.clear()
+    for cls in [type("C%s" % i, (object,), {}) for i in range(10)]:
+        assert describe("a", cls) == "a " + cls.__name__
+        assert len(text._class_descriptions) <= 4
+
+
+def test_instances_are_described_fresh():
+    w = Widget()
+    assert describe("the", w).startswith("the Widget at '0x")
+    assert not any(key[1] is w for key in text._class_descriptions)